@@ -1,11 +1,19 @@
 import abc
 
 class Renderer(metaclass=abc.ABCMeta):
+    # renderers that set this get apply_changes instead of render during play; others never pay for the changes
+    wants_changes: bool = False
+
     @abc.abstractmethod
     def render(self, game_state, players: list) -> None:
         """Render the current game state & player information
         Parameters: game_state: GameState, players: list[Player]"""
 
+    def apply_changes(self, game_state, players: list, changes: list) -> None:
+        """Optional diff-based path: update only what changes describes; by default, render everything
+        Parameters: game_state: GameState, players: list[Player], changes: list[Change]"""
+        self.render(game_state, players)
+
     @abc.abstractmethod
     def render_error(self, exc: Exception) -> None:
         """Render an exception"""
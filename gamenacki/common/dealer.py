@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import random
 
 from gamenacki.common.stack import Stack
@@ -10,13 +10,17 @@ class Dealer:
     dealer_idx: int = None
     player_turn_idx: int = None
     current_round_number = 1
+    # the game's stream; GameState hands it on to each new Deck
+    rng: random.Random | None = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
-        self.dealer_idx = self.select_random_p_idx()
-        self.player_turn_idx = self.next_player_idx()
+        if self.dealer_idx is None:
+            self.dealer_idx = self.select_random_p_idx()
+        if self.player_turn_idx is None:
+            self.player_turn_idx = self.next_player_idx()
 
     def select_random_p_idx(self):
-        return random.randint(0, self.player_cnt - 1)
+        return (self.rng or random).randint(0, self.player_cnt - 1)
 
     def next_player_idx(self) -> int:
         if self.player_turn_idx is None:
@@ -0,0 +1,76 @@
+"""A bounded cache of evaluations keyed on what the evaluator may see (ex: InformationSet.key()), evicting the least
+recently used.
+
+SHARED_CACHE is one cache for every player in a process. Reads & writes take a lock, so players running in threads
+(see async_engine) can share it. A pickled cache arrives empty, & SHARED_CACHE arrives as the receiving process' own.
+
+Example usage:
+    info_set = InformationSet.from_game_state(gs, p_idx)
+    value = SHARED_CACHE.get_or_compute(info_set.key(), lambda: evaluate(info_set))
+"""
+
+from collections import OrderedDict
+import threading
+from typing import Any, Callable, Hashable
+
+_MISSING = object()
+
+
+class EvalCache:
+    def __init__(self, max_entries: int = 100_000):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __reduce__(self):
+        if self is SHARED_CACHE:
+            return 'SHARED_CACHE'
+        return EvalCache, (self.max_entries,)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """The cached value, else compute()'s, which is then cached; compute runs outside the lock"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+SHARED_CACHE = EvalCache()
@@ -1,20 +1,36 @@
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import TYPE_CHECKING
+from enum import IntEnum
+import time
+from typing import Callable, TYPE_CHECKING
 
 from gamenacki.common.stack import Stack
 
 if TYPE_CHECKING:
-    from gamenacki.lostcitinacki.models.game_state import GameState
+    from gamenacki.lostcitinacki.models.snapshot import GameStateSnapshot
     from gamenacki.lostcitinacki.models.constants import Action
 
+class LogLevel(IntEnum):
+    """How much an engine logs: nothing, the game & round boundaries, or those & every play & draw"""
+    OFF = 0
+    ROUNDS = 1
+    ACTIONS = 2
+
+
 @dataclass(frozen=True)
 class Event:
-    game_state: "GameState"
+    """game_state is a point-in-time snapshot, not the live GameState"""
+    game_state: "GameStateSnapshot"
     action: "Action"
     player_idx: int = None
     attributes: dict = field(default_factory=dict)
-    timestamp: datetime = datetime.now()
+    created: float = field(default_factory=time.time, repr=False)
+
+    @property
+    def timestamp(self) -> datetime:
+        """When the event was created; only made into a datetime when asked for"""
+        return datetime.fromtimestamp(self.created)
 
     def __repr__(self) -> str:
         return (f"Timestamp: {self.timestamp}\n"
@@ -26,4 +42,39 @@ class Event:
 
 @dataclass
 class Log(Stack):
+    """listeners are called with every pushed Event, ex: to stream a game record as it is played.
+    Engines only build & push the Events that level is enabled for, so listeners see no more than that.
+    With a capacity, only the latest `capacity` Events are kept (a ring buffer), so memory stays flat however long
+    the Log runs. A listener that needs more than some level declares it as a min_level attribute, & a Log below
+    that level refuses it rather than feeding it too little"""
     events: list[Event] = field(default_factory=list)
+    listeners: list[Callable[[Event], None]] = field(default_factory=list)
+    level: LogLevel = LogLevel.ACTIONS
+    capacity: int | None = None
+
+    def __post_init__(self):
+        super().__post_init__()
+        if self.capacity is not None:
+            if self.capacity < 1:
+                raise ValueError("capacity must be at least 1")
+            self._items = deque(self._items, maxlen=self.capacity)
+        for listener in self.listeners:
+            self._check_level(listener)
+
+    def _check_level(self, listener: Callable[[Event], None]) -> None:
+        min_level = getattr(listener, 'min_level', LogLevel.OFF)
+        if min_level > self.level:
+            raise ValueError(f"{type(listener).__name__} needs a Log level of at least {min_level.name}, "
+                             f"not {self.level.name}")
+
+    def add_listener(self, listener: Callable[[Event], None]) -> None:
+        self._check_level(listener)
+        self.listeners.append(listener)
+
+    def enabled(self, level: LogLevel) -> bool:
+        return level <= self.level
+
+    def push(self, item: Event):
+        super().push(item)
+        for listener in self.listeners:
+            listener(item)
@@ -4,6 +4,7 @@ CardStack allows its implementers to use the attribute 'cards' instead of 'items
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 import random
+from typing import Sequence
 
 from gamenacki.common.stack import Stack
 from gamenacki.lostcitinacki.models.cards import Card
@@ -33,16 +34,23 @@ class CardStack(Stack, ABC):
 class BaseDeck(CardStack, ABC):
     _items: list[Card] = field(default_factory=list)
     start_shuffled: bool = True
+    rng: random.Random | None = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
-        self._items = self.build_deck()
+        self._items = list(self.build_deck())
         if self.start_shuffled:
-            random.shuffle(self._items)
+            self.shuffle(self.rng)
+
+    def reset(self, rng: random.Random | None = None) -> None:
+        """Refills & reshuffles this deck in place, reusing its list, as if it had just been built"""
+        self._items[:] = self.build_deck()
+        if self.start_shuffled:
+            self.shuffle(rng or self.rng)
 
     @staticmethod
     @abstractmethod
-    def build_deck() -> list[Card]:
-        ...
+    def build_deck() -> Sequence[Card]:
+        """The cards of a new deck, in order; may be a shared, immutable sequence"""
 
 
 @dataclass
@@ -0,0 +1,75 @@
+"""Optional instrumentation: per-phase timers & call counters, with a summary report.
+
+Engines & game states hold a Profiler or None: an engine without one picks its untimed path once per game & checks
+for it before each phase of LostCitiesCore, & GameState checks for it before each count, so a game without one pays
+for little more than those checks.
+
+Example usage:
+    profiler = Profiler()
+    LostCities(players, NullRenderer(), round_pause=0, profiler=profiler).play()
+    print(profiler.report())
+"""
+
+from collections import Counter
+import time
+
+
+class _Phase:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.profiler.add_time(self.name, time.perf_counter() - self.start)
+
+
+class Profiler:
+    def __init__(self):
+        self.seconds: Counter[str] = Counter()
+        self.phase_calls: Counter[str] = Counter()
+        self.counts: Counter[str] = Counter()
+        self._phases: dict[str, _Phase] = {}
+
+    def phase(self, name: str) -> _Phase:
+        """A reusable context manager that times its block into `name`; phases of one name must not nest"""
+        phase = self._phases.get(name)
+        if phase is None:
+            phase = self._phases[name] = _Phase(self, name)
+        return phase
+
+    def add_time(self, name: str, seconds: float) -> None:
+        self.seconds[name] += seconds
+        self.phase_calls[name] += 1
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counts[name] += n
+
+    def merge(self, other: "Profiler") -> None:
+        self.seconds.update(other.seconds)
+        self.phase_calls.update(other.phase_calls)
+        self.counts.update(other.counts)
+
+    def reset(self) -> None:
+        self.seconds.clear()
+        self.phase_calls.clear()
+        self.counts.clear()
+
+    def report(self) -> str:
+        """Phases by total time, with their share of all timed phases, then counters by count"""
+        total = sum(self.seconds.values()) or 1.0
+        lines = [f"{'phase':<30}{'calls':>10}{'total ms':>12}{'mean us':>10}{'share':>8}"]
+        for name, seconds in self.seconds.most_common():
+            calls = self.phase_calls[name]
+            lines.append(f"{name:<30}{calls:>10}{seconds * 1e3:>12.2f}{seconds / calls * 1e6:>10.2f}"
+                         f"{seconds / total:>8.1%}")
+        if self.counts:
+            lines.append(f"{'counter':<30}{'calls':>10}")
+            lines.extend(f"{name:<30}{n:>10}" for name, n in self.counts.most_common())
+        return '\n'.join(lines)
+
@@ -0,0 +1,22 @@
+"""Per-game random number streams, so games can be reproduced one at a time & split across processes.
+
+Components that draw random numbers (Dealer, Deck, Stack.shuffle, bots) take a random.Random & fall back to the global
+`random` module without one. Seeds are counter-based: derive_seed(seed, *path) depends only on its arguments, so
+the streams of game 123_456 of a run, or of worker 7, can be made without making any others first.
+
+Example usage:
+    rng = spawn(run_seed, 'game', game_idx)
+    gs = GameState.create_game_state(2, 3, rng)
+"""
+
+import random
+
+
+def derive_seed(seed: int, *path: int | str) -> int:
+    """A 64-bit seed that depends only on seed & path; distinct paths give unrelated streams"""
+    return random.Random(':'.join(str(p) for p in (seed, *path))).getrandbits(64)
+
+
+def spawn(seed: int, *path: int | str) -> random.Random:
+    """The stream at path under seed"""
+    return random.Random(derive_seed(seed, *path))
@@ -0,0 +1,59 @@
+"""One-pass accumulators for streams of numbers too long to keep.
+
+RunningStat updates its mean & variance per value (Welford) & merges with another in O(1) (Chan et al.), so workers
+can each accumulate part of a stream & the parts combine exactly as if one accumulator had seen it all.
+
+Example usage:
+    stat = RunningStat()
+    for margin in margins:
+        stat.add(margin)
+    stat.merge(stat_from_worker)
+"""
+
+from dataclasses import dataclass
+import math
+
+
+@dataclass
+class RunningStat:
+    """m2 is the sum of squared differences from the mean; a rate is the mean of 0s & 1s"""
+    n: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        delta = x - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other: "RunningStat") -> None:
+        if not other.n:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.n = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance"""
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+    @property
+    def sem(self) -> float:
+        """Standard error of the mean"""
+        return math.sqrt(self.variance / self.n) if self.n else math.inf
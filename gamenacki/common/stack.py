@@ -20,8 +20,8 @@ class Stack(Generic[T]):
     def __len__(self) -> int:
         return len(self._items) if self._items else 0
 
-    def shuffle(self):
-        random.shuffle(self._items)
+    def shuffle(self, rng: random.Random | None = None):
+        (rng or random).shuffle(self._items)
 
     def push(self, item: T):
         self._items.append(item)
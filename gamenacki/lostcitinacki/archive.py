@@ -0,0 +1,155 @@
+"""A memory-mapped archive of recorded games, with a fixed-width index for random access & filtered scans.
+
+Layout:
+    header   MAGIC, player_cnt (u8), game_cnt (u64), index_offset (u64)
+    games    each game's records (see records.py) back to back, without the record file MAGIC
+    index    one entry per game: offset (u64), length (u32), winner (i8, -1 for a tie), round_cnt (u8),
+             final points per player (i16 each)
+
+Example usage:
+    with GameArchiveWriter('games.lca') as writer:
+        simulate(game_cnt=1000, seed=7, listeners=[writer])
+    with GameArchive('games.lca') as archive:
+        wins = list(archive.find(winner=0))
+        gs = archive.replay(wins[0], turn=20)
+"""
+
+from dataclasses import dataclass
+import io
+import mmap
+import struct
+from typing import Iterator
+
+from gamenacki.common.log import Event
+from gamenacki.lostcitinacki.models.constants import Action
+from gamenacki.lostcitinacki.models.game_state import GameState
+from gamenacki.lostcitinacki.records import GameRecordWriter, Record, RoundEndRecord, iter_records, replay
+
+MAGIC = b'LCA\x01'
+_HEADER = struct.Struct('<4sBxxxQQ')
+TIE = -1
+
+
+def _index_entry(player_cnt: int) -> struct.Struct:
+    return struct.Struct(f'<QIbB{player_cnt}h')
+
+
+@dataclass(frozen=True, slots=True)
+class GameSummary:
+    offset: int
+    length: int
+    winner: int
+    round_cnt: int
+    points: tuple[int, ...]
+
+
+def summarize(record: bytes | memoryview) -> tuple[int, int, tuple[int, ...]]:
+    """Returns (winner, round_cnt, final points) of one game's records; winner is TIE when the top score is shared"""
+    round_points = [r.points for r in iter_records(record) if isinstance(r, RoundEndRecord)]
+    points = tuple(sum(p) for p in zip(*round_points))
+    leaders = [i for i, p in enumerate(points) if p == max(points)] if points else []
+    return (leaders[0] if len(leaders) == 1 else TIE), len(round_points), points
+
+
+class GameArchiveWriter:
+    """Writes games to an archive, either from whole records via add_game or, as a Log listener, as games are played.
+    The index & header are written on close"""
+    min_level = GameRecordWriter.min_level
+
+    def __init__(self, path: str, player_cnt: int = 2):
+        self.player_cnt = player_cnt
+        self._file = open(path, 'wb')
+        self._file.write(_HEADER.pack(MAGIC, player_cnt, 0, 0))
+        self._entry = _index_entry(player_cnt)
+        self._index = bytearray()
+        self._game_cnt = 0
+        self._buffer = io.BytesIO()
+        self._recorder = GameRecordWriter(self._buffer, write_magic=False)
+
+    def __enter__(self) -> "GameArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __call__(self, event: Event) -> None:
+        self._recorder(event)
+        if event.action == Action.END_GAME:
+            self.add_game(self._buffer.getvalue())
+            self._buffer.seek(0)
+            self._buffer.truncate()
+
+    def add_game(self, record: bytes) -> int:
+        """Appends one game's records & returns its game number"""
+        winner, round_cnt, points = summarize(record)
+        self._index += self._entry.pack(self._file.tell(), len(record), winner, round_cnt, *points)
+        self._file.write(record)
+        self._game_cnt += 1
+        return self._game_cnt - 1
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        self._file.write(self._index)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, self.player_cnt, self._game_cnt, index_offset))
+        self._file.close()
+
+
+class GameArchive:
+    """Read-only, memory-mapped access to an archive; records & index scans are zero-copy views of the file.
+    Views handed out must be released before close"""
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.player_cnt, self.game_cnt, index_offset = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"{path} is not a game archive")
+        self._entry = _index_entry(self.player_cnt)
+        self._view = memoryview(self._mm)
+        self._index = self._view[index_offset:index_offset + self.game_cnt * self._entry.size]
+
+    def __enter__(self) -> "GameArchive":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self.game_cnt
+
+    def __getitem__(self, n: int) -> memoryview:
+        """The records of game n"""
+        summary = self.summary(n)
+        return self._view[summary.offset:summary.offset + summary.length]
+
+    def summary(self, n: int) -> GameSummary:
+        if not 0 <= n < self.game_cnt:
+            raise IndexError(f"Game {n} is not in the archive")
+        offset, length, winner, round_cnt, *points = self._entry.unpack_from(self._index, n * self._entry.size)
+        return GameSummary(offset, length, winner, round_cnt, tuple(points))
+
+    def summaries(self) -> Iterator[GameSummary]:
+        for offset, length, winner, round_cnt, *points in self._entry.iter_unpack(self._index):
+            yield GameSummary(offset, length, winner, round_cnt, tuple(points))
+
+    def find(self, winner: int | None = None, round_cnt: int | None = None) -> Iterator[int]:
+        """Yields the numbers of games matching every given field, scanning only the index"""
+        for n, (_, _, game_winner, game_round_cnt, *_) in enumerate(self._entry.iter_unpack(self._index)):
+            if (winner is None or game_winner == winner) and (round_cnt is None or game_round_cnt == round_cnt):
+                yield n
+
+    def records(self, n: int) -> Iterator[Record]:
+        return iter_records(self[n])
+
+    def replay(self, n: int, turn: int | None = None) -> GameState:
+        """The GameState of game n after `turn` turns, or at its end"""
+        return replay(self.records(n), turn)
+
+    def close(self) -> None:
+        self._index.release()
+        self._view.release()
+        self._mm.close()
@@ -0,0 +1,195 @@
+"""An asyncio variant of LostCities, so one process can host many games whose players answer slowly.
+
+AsyncPlayer & AsyncRenderer are the async counterparts of Player & Renderer. Sync players & renderers still work:
+AsyncLostCities wraps them in SyncPlayer & SyncRenderer. A SyncPlayer runs each call in a worker thread, so a
+blocking ConsolePlayer does not stall the other games. Threads are limited, though, so players that wait on the
+network should implement AsyncPlayer instead.
+
+With a move_timeout, a player who has not chosen a card in time plays the first of GameState.legal_moves, & one who
+has not chosen where to draw from draws from the deck.
+
+Example usage:
+    games = [AsyncLostCities([RemotePlayer(0, 'Nacki', conn), BotPlayer(1, 'Bot', think_time=0)], NullRenderer(),
+                             move_timeout=30) for conn in connections]
+    asyncio.run(play_all(games))
+"""
+
+from abc import ABC, abstractmethod
+import asyncio
+from dataclasses import dataclass
+import random
+
+from gamenacki.common.base_renderer import Renderer
+from gamenacki.common.log import Log
+from gamenacki.common.piles import Hand
+from gamenacki.lostcitinacki.engine import LostCitiesCore, Step
+from gamenacki.lostcitinacki.models.cards import Card
+from gamenacki.lostcitinacki.models.changes import Change
+from gamenacki.lostcitinacki.models.constants import DrawFromStack, PlayToStack
+from gamenacki.lostcitinacki.models.game_state import GameState
+from gamenacki.lostcitinacki.players import Player
+
+
+@dataclass
+class AsyncPlayer(ABC):
+    idx: int
+    name: str
+
+    async def observe(self, gs: GameState) -> None:
+        """Called before play_card with the live GameState"""
+
+    def use_rng(self, rng: random.Random) -> None:
+        """Offered a stream of the game's seed by a seeded engine, as Player.use_rng"""
+
+    @abstractmethod
+    async def play_card(self, h: Hand, board_playable_cards: list[Card]) -> tuple[Card, PlayToStack]:
+        ...
+
+    @abstractmethod
+    async def pick_up_from(self, can_pick_up_discard: bool, is_discard_card_playable: bool) -> DrawFromStack:
+        """Only called when the discard may be drawn from, unlike Player.pick_up_from"""
+
+
+class AsyncRenderer(ABC):
+    wants_changes: bool = False
+
+    @abstractmethod
+    async def render(self, gs: GameState, players: list) -> None:
+        ...
+
+    async def apply_changes(self, gs: GameState, players: list, changes: list[Change]) -> None:
+        await self.render(gs, players)
+
+    @abstractmethod
+    async def render_error(self, exc: Exception) -> None:
+        ...
+
+    @abstractmethod
+    async def render_log(self, game_log: Log) -> None:
+        ...
+
+
+@dataclass
+class SyncPlayer(AsyncPlayer):
+    """Adapts a Player; with in_thread=False its calls run on the event loop, which suits players that never block.
+    A call that times out is abandoned, but its thread runs on until the player answers"""
+    player: Player = None
+    in_thread: bool = True
+
+    @classmethod
+    def wrap(cls, player: Player, in_thread: bool = True) -> "SyncPlayer":
+        return cls(player.idx, player.name, player, in_thread)
+
+    async def _call(self, method, *args):
+        return await asyncio.to_thread(method, *args) if self.in_thread else method(*args)
+
+    async def observe(self, gs: GameState) -> None:
+        self.player.observe(gs)
+
+    def use_rng(self, rng: random.Random) -> None:
+        self.player.use_rng(rng)
+
+    async def play_card(self, h: Hand, board_playable_cards: list[Card]) -> tuple[Card, PlayToStack]:
+        return await self._call(self.player.play_card, h, board_playable_cards)
+
+    async def pick_up_from(self, can_pick_up_discard: bool, is_discard_card_playable: bool) -> DrawFromStack:
+        return await self._call(self.player.pick_up_from, can_pick_up_discard, is_discard_card_playable)
+
+
+@dataclass
+class SyncRenderer(AsyncRenderer):
+    renderer: Renderer
+
+    def __post_init__(self):
+        self.wants_changes = self.renderer.wants_changes
+
+    async def render(self, gs: GameState, players: list) -> None:
+        self.renderer.render(gs, players)
+
+    async def apply_changes(self, gs: GameState, players: list, changes: list[Change]) -> None:
+        self.renderer.apply_changes(gs, players, changes)
+
+    async def render_error(self, exc: Exception) -> None:
+        self.renderer.render_error(exc)
+
+    async def render_log(self, game_log: Log) -> None:
+        self.renderer.render_log(game_log)
+
+
+@dataclass
+class AsyncLostCities(LostCitiesCore):
+    players: list[AsyncPlayer | Player]
+    renderer: AsyncRenderer | Renderer
+    move_timeout: float | None = None
+
+    def __post_init__(self):
+        self.players = [p if isinstance(p, AsyncPlayer) else SyncPlayer.wrap(p) for p in self.players]
+        if isinstance(self.renderer, Renderer):
+            self.renderer = SyncRenderer(self.renderer)
+        super().__post_init__()
+
+    def new_game(self, seed: int | None = None) -> None:
+        """Readies this engine for another game, reusing its GameState; the log is cleared but keeps its listeners.
+        With a seed, the game & its players draw from streams derived from it, as in a new engine"""
+        self.seed = seed
+        rng = self._seed_players()
+        if rng is not None:
+            self.gs.dealer.rng = rng
+        self.gs.create_new_game()
+        self.turn_cnts.clear()
+        self.log.clear()
+        self._log_begin_game()
+
+    async def _timed(self, awaitable, player: AsyncPlayer, default):
+        """Awaits a player's answer, or returns default once move_timeout seconds have passed"""
+        if self.move_timeout is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, self.move_timeout)
+        except asyncio.TimeoutError:
+            await self.renderer.render_error(TimeoutError(f"{player.name} ran out of time; playing for them"))
+            return default
+
+    async def play(self) -> None:
+        """A renderer with wants_changes gets apply_changes where others get render"""
+        steps = self._steps()
+        reply, error = None, None
+        while True:
+            try:
+                step = steps.throw(error) if error is not None else steps.send(reply)
+            except StopIteration:
+                return
+            reply, error = None, None
+            try:
+                reply = await self._run(step)
+            except Exception as ex:
+                error = ex
+
+    async def _run(self, step: tuple):
+        kind = step[0]
+        if kind == Step.PLAY_CARD:
+            turn_idx = step[1]
+            player = self.players[turn_idx]
+            await player.observe(self.gs)
+            default_card, default_play_to, _ = self.gs.legal_moves()[0]
+            return await self._timed(player.play_card(self.gs.piles.hands[turn_idx], self.gs.board_playable_cards),
+                                     player, (default_card, default_play_to))
+        if kind == Step.PICK_UP:
+            player = self.players[step[1]]
+            return await self._timed(player.pick_up_from(True, self.gs.is_discard_card_playable), player,
+                                     DrawFromStack.DECK)
+        if kind == Step.RENDER:
+            await self.renderer.render(self.gs, self.players)
+        elif kind == Step.CHANGES:
+            await self.renderer.apply_changes(self.gs, self.players, step[1])
+        elif kind == Step.ERROR:
+            await self.renderer.render_error(step[1])
+        elif kind == Step.PAUSE:
+            await asyncio.sleep(step[1])
+        elif kind == Step.RENDER_LOG:
+            await self.renderer.render_log(self.log)
+
+
+async def play_all(games: list[AsyncLostCities]) -> None:
+    """Plays the games concurrently; one game's error does not stop the others"""
+    await asyncio.gather(*(g.play() for g in games), return_exceptions=True)
@@ -0,0 +1,228 @@
+"""A NumPy engine that plays many independent games in lockstep; requires numpy.
+
+Cards use the codes of models.compact. Hands & boards are card counts shaped (N, players, 40), with a color's
+handshakes all counted at its slot 0; deck & discard are code stacks shaped (N, 40) with a length per game.
+Rounds are played in lockstep: a round continues until every game's round is over, finished games sitting idle.
+
+Scoring mirrors Expedition.points & legality mirrors GameState._play_to_exp_pile, with drawing from the discard
+only allowed after playing to an expedition, as in LostCities.play. BatchGames.from_game_states loads rounds from the
+object engine, & the same moves from those then give the same piles & points. BatchGames.new & deal shuffle with
+their NumPy Generator, so their deals have nothing to do with the object engine's seeds.
+
+Example usage:
+    games = BatchGames.new(100_000, np.random.default_rng(7))
+    ledgers = games.play(np.random.default_rng(8))
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from gamenacki.lostcitinacki.models.compact import (CARD_CNT, COLORS, SLOTS_PER_COLOR, VALUES, CompactState,
+                                                     encode, mask_add)
+from gamenacki.lostcitinacki.models.piles import FULL_DECK
+
+HAND_SIZE = 8
+COLOR_CNT = len(COLORS)
+CARD_VALUES = np.array(VALUES, dtype=np.int16)
+CODE_COLORS = np.arange(CARD_CNT) // SLOTS_PER_COLOR
+FULL_DECK_CODES = np.array([encode(c) for c in FULL_DECK], dtype=np.int8)
+
+
+def board_points(boards: np.ndarray) -> np.ndarray:
+    """Expedition.points summed per board for card counts shaped (..., 40)"""
+    by_color = boards.reshape(*boards.shape[:-1], COLOR_CNT, SLOTS_PER_COLOR).astype(np.int16)
+    card_cnt = by_color.sum(-1)
+    handshake_cnt = by_color[..., 0]
+    value_sum = (by_color * CARD_VALUES.reshape(COLOR_CNT, SLOTS_PER_COLOR)).sum(-1)
+    points = (value_sum - 20) * (1 + handshake_cnt) + np.where(card_cnt >= 8, 20, 0)
+    return np.where(card_cnt > 0, points, 0).sum(-1)
+
+
+@dataclass
+class BatchGames:
+    hands: np.ndarray
+    boards: np.ndarray
+    deck: np.ndarray
+    deck_len: np.ndarray
+    discard: np.ndarray
+    discard_len: np.ndarray
+    color_maxes: np.ndarray
+    dealer: np.ndarray
+    turn: np.ndarray
+    ledgers: np.ndarray
+    round_number: int = 1
+    max_rounds: int = 3
+
+    @classmethod
+    def empty(cls, n: int, player_cnt: int = 2, max_rounds: int = 3) -> "BatchGames":
+        return cls(hands=np.zeros((n, player_cnt, CARD_CNT), np.int8),
+                   boards=np.zeros((n, player_cnt, CARD_CNT), np.int8),
+                   deck=np.zeros((n, CARD_CNT), np.int8), deck_len=np.zeros(n, np.int16),
+                   discard=np.zeros((n, CARD_CNT), np.int8), discard_len=np.zeros(n, np.int16),
+                   color_maxes=np.zeros((n, COLOR_CNT), np.int8),
+                   dealer=np.zeros(n, np.int8), turn=np.zeros(n, np.int8),
+                   ledgers=np.zeros((n, player_cnt, max_rounds), np.int16), max_rounds=max_rounds)
+
+    @classmethod
+    def new(cls, n: int, rng: np.random.Generator, player_cnt: int = 2, max_rounds: int = 3) -> "BatchGames":
+        games = cls.empty(n, player_cnt, max_rounds)
+        games.dealer[:] = rng.integers(0, player_cnt, n)
+        games.deal(rng)
+        return games
+
+    @classmethod
+    def from_game_states(cls, states: list) -> "BatchGames":
+        """Loads the current round of each GameState; all must share player count, max rounds & round number"""
+        games = cls.empty(len(states), states[0].player_cnt, states[0].max_rounds)
+        games.round_number = states[0].dealer.current_round_number
+        for i, gs in enumerate(states):
+            for p_idx, (hand, board) in enumerate(zip(gs.piles.hands, gs.piles.exp_boards)):
+                for c in hand:
+                    games.hands[i, p_idx, encode(c)] += 1
+                for c in (c for exp in board for c in exp):
+                    games.boards[i, p_idx, encode(c)] += 1
+            for stack, stack_len, pile in ((games.deck, games.deck_len, gs.piles.deck),
+                                           (games.discard, games.discard_len, gs.piles.discard)):
+                stack_len[i] = len(pile)
+                stack[i, :len(pile)] = [encode(c) for c in pile]
+            games.color_maxes[i] = [gs.color_maxes[c] for c in COLORS]
+            games.dealer[i], games.turn[i] = gs.dealer.dealer_idx, gs.dealer.player_turn_idx
+            for p_idx, pl in enumerate(gs.scorer.ledgers):
+                games.ledgers[i, p_idx, :len(pl.ledger)] = pl.ledger
+        return games
+
+    @property
+    def n(self) -> int:
+        return len(self.turn)
+
+    @property
+    def player_cnt(self) -> int:
+        return self.hands.shape[1]
+
+    @property
+    def is_round_over(self) -> np.ndarray:
+        return (self.deck_len == 0) | (self.color_maxes == 10).all(1)
+
+    @property
+    def is_game_over(self) -> bool:
+        return self.round_number >= self.max_rounds and bool(self.is_round_over.all())
+
+    @property
+    def points(self) -> np.ndarray:
+        """The current round's points, shaped (N, players)"""
+        return board_points(self.boards)
+
+    @property
+    def totals(self) -> np.ndarray:
+        return self.ledgers.sum(-1)
+
+    def deal(self, rng: np.random.Generator) -> None:
+        """Shuffles a fresh deck per game & deals like Dealer.deal, starting left of the dealer"""
+        n, player_cnt = self.n, self.player_cnt
+        self.deck[:] = FULL_DECK_CODES[np.argsort(rng.random((n, CARD_CNT)), axis=1)]
+        dealt_cnt = HAND_SIZE * player_cnt
+        self.deck_len[:] = CARD_CNT - dealt_cnt
+        dealt = self.deck[:, ::-1][:, :dealt_cnt].reshape(n, HAND_SIZE, player_cnt)
+        rows = np.arange(n)
+        for j in range(player_cnt):
+            players = (self.dealer + 1 + j) % player_cnt
+            for k in range(HAND_SIZE):
+                np.add.at(self.hands, (rows, players, dealt[:, k, j]), 1)
+        self.turn[:] = (self.dealer + 1) % player_cnt
+
+    def new_round(self, rng: np.random.Generator) -> None:
+        """Clears every game, advances the button & deals, as GameState.create_new_round"""
+        self.hands[:] = 0
+        self.boards[:] = 0
+        self.discard_len[:] = 0
+        self.color_maxes[:] = 0
+        self.dealer[:] = (self.dealer + 1) % self.player_cnt
+        self.deal(rng)
+        self.round_number += 1
+
+    def assign_points(self) -> None:
+        self.ledgers[:, :, self.round_number - 1] = self.points
+
+    def playable(self) -> np.ndarray:
+        """(N, 40) mask of the current player's cards that may go to an expedition, as board_playable_cards"""
+        color_maxes = self.color_maxes[:, CODE_COLORS]
+        in_hand = self.hands[np.arange(self.n), self.turn] > 0
+        return in_hand & ((color_maxes == 0) | (CARD_VALUES > color_maxes))
+
+    def step(self, codes: np.ndarray, to_discard: np.ndarray, from_discard: np.ndarray) -> None:
+        """One turn in every game whose round is not over; the arguments are shaped (N,) & ignored elsewhere.
+        Raises ValueError, changing nothing, if any of those moves is illegal, drawing from the discard included"""
+        idx = np.flatnonzero(~self.is_round_over)
+        p_idx, code = self.turn[idx].astype(np.intp), codes[idx].astype(np.intp)
+        to_exp = ~to_discard[idx].astype(bool)
+        value, color = CARD_VALUES[code], CODE_COLORS[code]
+        color_max = self.color_maxes[idx, color]
+        if (self.hands[idx, p_idx, code] <= 0).any():
+            raise ValueError(f"Cards are not in the hand in games {idx[self.hands[idx, p_idx, code] <= 0]}")
+        too_low = to_exp & (color_max > value) & (value > 0)
+        if too_low.any():
+            raise ValueError(f"You must play higher in games {idx[too_low]}")
+        draws_discard = from_discard[idx].astype(bool)
+        bad_draw = draws_discard & (~to_exp | (self.discard_len[idx] == 0))
+        if bad_draw.any():
+            raise ValueError(f"The discard may only be drawn from, when not empty, after playing to an expedition; "
+                             f"games {idx[bad_draw]}")
+
+        self.hands[idx, p_idx, code] -= 1
+        e = idx[to_exp]
+        self.boards[e, p_idx[to_exp], code[to_exp]] += 1
+        self.color_maxes[e, color[to_exp]] = np.maximum(color_max[to_exp], value[to_exp])
+        d = idx[~to_exp]
+        self.discard[d, self.discard_len[d]] = code[~to_exp]
+        self.discard_len[d] += 1
+
+        # a game whose deck is empty has its round over, so every deck draw has a card
+        dd, dk = idx[draws_discard], idx[~draws_discard]
+        self.discard_len[dd] -= 1
+        self.deck_len[dk] -= 1
+        drawn = np.empty(len(idx), np.intp)
+        drawn[draws_discard] = self.discard[dd, self.discard_len[dd]]
+        drawn[~draws_discard] = self.deck[dk, self.deck_len[dk]]
+        self.hands[idx, p_idx, drawn] += 1
+        self.turn[idx] = (p_idx + 1) % self.player_cnt
+
+    def random_actions(self, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """BotPlayer's policy, vectorized: a random playable card to its expedition, else a random discard;
+        after playing to an expedition, a playable discard top is drawn 80% of the time"""
+        rows = np.arange(self.n)
+        playable = self.playable()
+        in_hand = self.hands[rows, self.turn] > 0
+        keys = rng.random((self.n, CARD_CNT))
+        has_playable = playable.any(1)
+        codes = np.where(has_playable, np.where(playable, keys, -1).argmax(1), np.where(in_hand, keys, -1).argmax(1))
+        top = self.discard[rows, np.maximum(self.discard_len - 1, 0)].astype(np.intp)
+        top_max = self.color_maxes[rows, CODE_COLORS[top]]
+        top_playable = (self.discard_len > 0) & ((top_max == 0) | (CARD_VALUES[top] > top_max))
+        from_discard = has_playable & top_playable & (rng.random(self.n) < 0.8)
+        return codes, ~has_playable, from_discard
+
+    def play(self, rng: np.random.Generator, policy=None) -> np.ndarray:
+        """Plays every game to its end & returns the ledgers, shaped (N, players, max_rounds).
+        policy(games, rng) returns step's arguments; it defaults to random_actions"""
+        policy = policy or (lambda games, policy_rng: games.random_actions(policy_rng))
+        while True:
+            while not self.is_round_over.all():
+                self.step(*policy(self, rng))
+            self.assign_points()
+            if self.round_number >= self.max_rounds:
+                return self.ledgers
+            self.new_round(rng)
+
+    def compact_state(self, i: int) -> CompactState:
+        """Game i's round as a CompactState, ex: to compare with CompactState.from_game_state"""
+        def mask(counts: np.ndarray) -> int:
+            m = 0
+            for code in np.flatnonzero(counts):
+                for _ in range(counts[code]):
+                    m = mask_add(m, int(code))
+            return m
+        return CompactState(hands=[mask(h) for h in self.hands[i]], boards=[mask(b) for b in self.boards[i]],
+                            deck=bytearray(self.deck[i, :self.deck_len[i]].astype(np.uint8).tobytes()),
+                            discard=bytearray(self.discard[i, :self.discard_len[i]].astype(np.uint8).tobytes()),
+                            color_maxes=[int(m) for m in self.color_maxes[i]], turn_idx=int(self.turn[i]))
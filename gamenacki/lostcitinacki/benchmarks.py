@@ -0,0 +1,164 @@
+"""Benchmarks for the engine, scoring & bots, appended as one JSON line per run so runs can be compared across commits.
+
+Each benchmark reports the best of `repeat` timings, in microseconds per operation. The batch benchmark needs numpy
+& is skipped without it.
+
+Example usage:
+    python -m gamenacki.lostcitinacki.benchmarks                  # appends a run to bench_output.txt
+    python -m gamenacki.lostcitinacki.benchmarks --compare        # & prints it against the file's previous run
+"""
+
+import argparse
+from dataclasses import asdict, dataclass
+import datetime
+import json
+import platform
+import random
+import subprocess
+import timeit
+from typing import Callable
+
+from gamenacki.common.piles import Hand
+from gamenacki.lostcitinacki.endgame import EndgameSolver
+from gamenacki.lostcitinacki.ismcts import default_policy
+from gamenacki.lostcitinacki.models.cards import ExpeditionCard, Handshake
+from gamenacki.lostcitinacki.models.compact import CompactState
+from gamenacki.lostcitinacki.models.constants import Color
+from gamenacki.lostcitinacki.models.game_state import GameState
+from gamenacki.lostcitinacki.models.piles import Expedition
+from gamenacki.lostcitinacki.simulation import default_bot_factory, play_game
+
+DEFAULT_OUTPUT = 'bench_output.txt'
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    name: str
+    us_per_op: float
+    ops: int
+
+    @property
+    def ops_per_s(self) -> float:
+        return 1e6 / self.us_per_op
+
+
+def bench(name: str, fn: Callable[[], object], repeat: int = 5, min_seconds: float = 0.2) -> BenchResult:
+    """Times fn, called enough times per repeat to take about min_seconds"""
+    timer = timeit.Timer(fn)
+    number = 1
+    while timer.timeit(number) < min_seconds:
+        number *= 2
+    best = min(timer.repeat(repeat, number))
+    return BenchResult(name, best / number * 1e6, number)
+
+
+def _mid_round_state() -> GameState:
+    gs = GameState.create_game_state(2, 3, random.Random(0))
+    for _ in range(10):
+        gs.apply(gs.legal_moves()[0])
+    return gs
+
+
+def _endgame_state(deck_size: int = 5) -> CompactState:
+    rng = random.Random(0)
+    cs = CompactState.from_game_state(GameState.create_game_state(2, 3, random.Random(0)))
+    while len(cs.deck) > deck_size:
+        cs.apply(default_policy(cs, rng))
+    return cs
+
+
+def _board_playable_cards(gs: GameState) -> None:
+    gs.clear_caches()
+    gs.board_playable_cards
+
+
+def _stack_remove(hand: Hand) -> None:
+    c = hand.cards[3]
+    hand.remove(c)
+    hand.push(c)
+
+
+def _batch_games(n: int) -> Callable[[], object] | None:
+    try:
+        import numpy as np
+        from gamenacki.lostcitinacki.batch import BatchGames
+    except ImportError:
+        return None
+    rng = np.random.default_rng(0)
+    return lambda: BatchGames.new(n, rng).play(rng)
+
+
+def run_benchmarks(repeat: int = 5, batch_size: int = 1000) -> list[BenchResult]:
+    gs = _mid_round_state()
+    exp = Expedition([Handshake(Color.RED), ExpeditionCard(Color.RED, 6), ExpeditionCard(Color.RED, 8),
+                      ExpeditionCard(Color.RED, 9), ExpeditionCard(Color.RED, 10)], Color.RED)
+    hand = Hand(list(gs.piles.hands[0].cards))
+    endgame = _endgame_state()
+    seeds = iter(range(10 ** 9))
+    results = [
+        bench('create_game_state', lambda: GameState.create_game_state(2, 3), repeat),
+        bench('board_playable_cards (rebuilt)', lambda: _board_playable_cards(gs), repeat),
+        bench('is_round_over', lambda: gs.is_round_over, repeat),
+        bench('Expedition.points', lambda: exp.points, repeat),
+        bench('Stack.remove', lambda: _stack_remove(hand), repeat),
+        bench('bot game (headless)', lambda: play_game(default_bot_factory(), next(seeds)), repeat),
+        bench('endgame solve (deck 5)', lambda: EndgameSolver(endgame.turn_idx).solve(endgame), repeat),
+    ]
+    batch = _batch_games(batch_size)
+    if batch is not None:
+        result = bench(f'batch of {batch_size} games', batch, repeat)
+        results.append(BenchResult('batch game', result.us_per_op / batch_size, result.ops * batch_size))
+    return results
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def write_run(results: list[BenchResult], path: str = DEFAULT_OUTPUT) -> dict:
+    run = {'timestamp': datetime.datetime.now().isoformat(timespec='seconds'), 'commit': _git_commit(),
+           'python': platform.python_version(), 'machine': platform.machine(),
+           'results': [asdict(r) for r in results]}
+    with open(path, 'a') as f:
+        f.write(json.dumps(run) + '\n')
+    return run
+
+
+def read_runs(path: str = DEFAULT_OUTPUT) -> list[dict]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(previous: dict, current: dict) -> list[tuple[str, float | None, float, float | None]]:
+    """(name, previous us/op, current us/op, speedup) per benchmark of current"""
+    before = {r['name']: r['us_per_op'] for r in previous['results']}
+    rows = []
+    for r in current['results']:
+        old = before.get(r['name'])
+        rows.append((r['name'], old, r['us_per_op'], old / r['us_per_op'] if old else None))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Lost Cities engine")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="JSON lines file that each run is appended to")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--compare', action='store_true', help="compare with the previous run in the output file")
+    args = parser.parse_args()
+
+    run = write_run(run_benchmarks(args.repeat), args.output)
+    runs = read_runs(args.output)
+    previous = runs[-2] if args.compare and len(runs) > 1 else None
+    for name, old, new, speedup in compare(previous or {'results': []}, run):
+        line = f'{name:<32} {new:>12.2f} us/op'
+        if speedup is not None:
+            line += f'   was {old:.2f} ({speedup:.2f}x, vs {previous["commit"]})'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
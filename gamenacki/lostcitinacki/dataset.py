@@ -0,0 +1,230 @@
+"""Self-play training data: every turn of simulated games as a fixed-width record, in memory-mappable .npy shards;
+requires numpy.
+
+A record is one decision seen by the player making it, taken before the turn: its hand & every board as card counts
+(shaped (40,) & (players, 40), codes as in models.compact with a color's handshakes counted at slot 0, the mover's own
+board first), the discard's top card (-1 when empty), deck size, round & game points so far (the mover's first). The
+action is the turn's records.turn_byte, & the outcome is the mover's final margin over the best other player & its
+result (1 win, split on ties, 0 loss). Each worker writes its own shards, only ever holding one shard's records.
+A run writes into an empty directory & lists its shards in a MANIFEST, which open_shards reads.
+
+Example usage:
+    report = generate('data', game_cnt=10_000, seed=7, workers=4)
+    print(report)
+    shards = open_shards('data')  # read-only memmaps; ex: shards[0]['hand'], shards[0]['action']
+
+    python -m gamenacki.lostcitinacki.dataset data --games 10000 --workers 4
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+import json
+import os
+import random
+import time
+from typing import Callable
+
+import numpy as np
+
+from gamenacki.common.log import Event, LogLevel
+from gamenacki.common.rng import derive_seed
+from gamenacki.lostcitinacki.models.compact import CARD_CNT
+from gamenacki.lostcitinacki.models.constants import Action
+from gamenacki.lostcitinacki.models.snapshot import GameStateSnapshot
+from gamenacki.lostcitinacki.players import Player
+from gamenacki.lostcitinacki.records import turn_byte
+from gamenacki.lostcitinacki.simulation import default_bot_factory, play_game
+
+SHARD_SUFFIX = '.npy'
+MANIFEST = 'manifest.json'
+
+
+def record_dtype(player_cnt: int = 2) -> np.dtype:
+    return np.dtype([('hand', np.int8, (CARD_CNT,)), ('boards', np.int8, (player_cnt, CARD_CNT)),
+                     ('discard_top', np.int8), ('deck_size', np.int8), ('round_number', np.int8),
+                     ('scores', np.int16, (player_cnt,)), ('seat', np.int8), ('action', np.uint8),
+                     ('margin', np.int16), ('result', np.float32)])
+
+
+def _counts(codes: bytes) -> np.ndarray:
+    return np.bincount(np.frombuffer(codes, dtype=np.uint8), minlength=CARD_CNT)
+
+
+class DecisionRecorder:
+    """A Log listener that makes a record of each turn; a game's records go to sink once the game's outcome is known.
+    It needs every play & draw logged"""
+    min_level = LogLevel.ACTIONS
+
+    def __init__(self, sink: Callable[[np.ndarray], None], player_cnt: int = 2):
+        self.sink = sink
+        self.dtype = record_dtype(player_cnt)
+        self._turns: list[tuple[int, GameStateSnapshot, int]] = []
+        self._before: GameStateSnapshot | None = None
+        self._play = None
+
+    def __call__(self, event: Event) -> None:
+        gs, action = event.game_state, event.action
+        if action == Action.PLAY_CARD:
+            self._play = event.attributes['card'], event.attributes['play_to']
+        elif action == Action.PICKUP_CARD:
+            if self._play is None:
+                raise ValueError("a draw was logged without the play before it")
+            c, play_to = self._play
+            self._play = None
+            self._turns.append((event.player_idx, self._before, turn_byte(c, play_to, event.attributes['draw_from'])))
+            self._before = gs
+        elif action == Action.BEGIN_ROUND:
+            self._before = gs
+        elif action == Action.END_GAME:
+            self.sink(self.encode_game(self._turns, [sum(ledger) for ledger in gs.ledgers]))
+            self._turns = []
+        elif action == Action.BEGIN_GAME:
+            self._turns = []
+
+    def encode_game(self, turns: list[tuple[int, GameStateSnapshot, int]], totals: list[int]) -> np.ndarray:
+        records = np.zeros(len(turns), self.dtype)
+        player_cnt = len(totals)
+        top = max(totals)
+        for i, (p_idx, gs, action) in enumerate(turns):
+            seats = [(p_idx + k) % player_cnt for k in range(player_cnt)]
+            r = records[i]
+            r['hand'] = _counts(gs.hands[p_idx])
+            r['boards'] = [_counts(gs.boards[seat]) for seat in seats]
+            r['discard_top'] = gs.discard[-1] if gs.discard else -1
+            r['deck_size'] = len(gs.deck)
+            r['round_number'] = gs.round_number
+            r['scores'] = [sum(gs.ledgers[seat]) for seat in seats]
+            r['seat'] = p_idx
+            r['action'] = action
+            r['margin'] = totals[p_idx] - max(t for seat, t in enumerate(totals) if seat != p_idx)
+            r['result'] = 1 / totals.count(top) if totals[p_idx] == top else 0.0
+        return records
+
+
+class ShardWriter:
+    """Buffers records & writes each full shard of shard_size records as its own .npy file, through open_memmap;
+    the last shard, written on close, may be shorter"""
+
+    def __init__(self, directory: str, prefix: str, dtype: np.dtype, shard_size: int = 100_000):
+        if shard_size < 1:
+            raise ValueError("shard_size must be at least 1")
+        self.directory = directory
+        self.prefix = prefix
+        self.paths: list[str] = []
+        self.sample_cnt = 0
+        self._buffer = np.zeros(shard_size, dtype)
+        self._cnt = 0
+
+    def __enter__(self) -> "ShardWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def add(self, records: np.ndarray) -> None:
+        start = 0
+        while start < len(records):
+            n = min(len(records) - start, len(self._buffer) - self._cnt)
+            self._buffer[self._cnt:self._cnt + n] = records[start:start + n]
+            self._cnt += n
+            start += n
+            if self._cnt == len(self._buffer):
+                self._write_shard()
+
+    def _write_shard(self) -> None:
+        path = os.path.join(self.directory, f'{self.prefix}-{len(self.paths):04d}{SHARD_SUFFIX}')
+        shard = np.lib.format.open_memmap(path, mode='w+', dtype=self._buffer.dtype, shape=(self._cnt,))
+        shard[:] = self._buffer[:self._cnt]
+        shard.flush()
+        del shard
+        self.paths.append(path)
+        self.sample_cnt += self._cnt
+        self._cnt = 0
+
+    def close(self) -> None:
+        if self._cnt:
+            self._write_shard()
+
+
+@dataclass
+class DatasetReport:
+    sample_cnt: int
+    game_cnt: int
+    seconds: float
+    paths: list[str] = field(default_factory=list, repr=False)
+
+    @property
+    def samples_per_s(self) -> float:
+        return self.sample_cnt / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.sample_cnt} samples from {self.game_cnt} games in {len(self.paths)} shards: "
+                f"{self.seconds:.1f}s, {self.samples_per_s:.0f} samples/s")
+
+
+def generate_games(directory: str, player_factory: Callable[[], list[Player]], seed: int, first_game_idx: int,
+                   game_cnt: int, max_rounds: int = 3, shard_size: int = 100_000,
+                   player_cnt: int = 2) -> tuple[list[str], int]:
+    """Games first_game_idx onward of the run seeded by seed (the same games simulate plays), into shards prefixed
+    by first_game_idx; returns the shard paths & sample count"""
+    with ShardWriter(directory, f'games-{first_game_idx:09d}', record_dtype(player_cnt), shard_size) as writer:
+        recorder = DecisionRecorder(writer.add, player_cnt)
+        for i in range(first_game_idx, first_game_idx + game_cnt):
+            play_game(player_factory(), derive_seed(seed, 'game', i), max_rounds, [recorder])
+    return writer.paths, writer.sample_cnt
+
+
+def generate(directory: str, player_factory: Callable[[], list[Player]] = default_bot_factory, game_cnt: int = 1,
+             seed: int | None = None, max_rounds: int = 3, workers: int = 1, games_per_chunk: int = 1000,
+             shard_size: int = 100_000, player_cnt: int = 2) -> DatasetReport:
+    """Splits the run into chunks of games played by worker processes, each writing its own shards.
+    player_factory must be picklable (ex: a module-level function) when workers > 1.
+    Raises ValueError when directory is not empty, so no earlier run's shards get mixed in"""
+    os.makedirs(directory, exist_ok=True)
+    if os.listdir(directory):
+        raise ValueError(f"{directory} is not empty")
+    seed = random.getrandbits(64) if seed is None else seed
+    chunks = [(first, min(games_per_chunk, game_cnt - first)) for first in range(0, game_cnt, games_per_chunk)]
+    start = time.perf_counter()
+    paths, sample_cnt = [], 0
+    if workers <= 1:
+        outputs = [generate_games(directory, player_factory, seed, first, cnt, max_rounds, shard_size, player_cnt)
+                   for first, cnt in chunks]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [pool.submit(generate_games, directory, player_factory, seed, first, cnt, max_rounds,
+                                   shard_size, player_cnt) for first, cnt in chunks]
+            outputs = [future.result() for future in as_completed(futures)]
+    for chunk_paths, chunk_sample_cnt in outputs:
+        paths.extend(chunk_paths)
+        sample_cnt += chunk_sample_cnt
+    report = DatasetReport(sample_cnt, game_cnt, time.perf_counter() - start, sorted(paths))
+    with open(os.path.join(directory, MANIFEST), 'w') as f:
+        json.dump({'seed': seed, 'game_cnt': game_cnt, 'sample_cnt': sample_cnt,
+                   'shards': [os.path.basename(path) for path in report.paths]}, f, indent=1)
+    return report
+
+
+def open_shards(directory: str) -> list[np.memmap]:
+    """The shards listed in directory's MANIFEST, in game order, memory-mapped read-only"""
+    with open(os.path.join(directory, MANIFEST)) as f:
+        names = json.load(f)['shards']
+    return [np.load(os.path.join(directory, name), mmap_mode='r') for name in names]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate self-play training data as .npy shards")
+    parser.add_argument('directory')
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--shard-size', type=int, default=100_000, help="records per shard")
+    args = parser.parse_args()
+
+    print(generate(args.directory, game_cnt=args.games, seed=args.seed, workers=args.workers,
+                   shard_size=args.shard_size))
+
+
+if __name__ == '__main__':
+    main()
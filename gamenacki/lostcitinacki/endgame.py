@@ -0,0 +1,180 @@
+"""An exact solver for the end of a round, once the deck is down to a handful of cards.
+
+solve() searches one determinization (a CompactState with every hand & the deck order filled in) to the end of the
+round with alpha-beta, a transposition table & move ordering. Values are one player's round margin: its points less
+the best of the other players'. Late in a round there is little left to hide, so endgame_move solves a few sampled
+determinizations of an InformationSet & plays the move that is best in the most of them; ISMCTSPlayer switches to it
+once the deck is at or below its endgame_deck_size.
+
+Deck 8, the size this solver was meant to reach, is not practical: on positions from random play, a deck of 6 solved
+in at most about 0.1 s, but at 8 most solves took well under a second while about 1 in 10 ran past 10 s, & a
+determinization's cost can't be told beforehand. Hence ISMCTSPlayer's default endgame_deck_size of 4 & its time limit.
+
+Example usage:
+    solver = EndgameSolver(p_idx=1)
+    value, (code, to_discard, from_discard) = solver.solve(InformationSet.from_game_state(gs, 1).sample(rng))
+"""
+
+import math
+from operator import itemgetter
+import random
+import time
+from typing import TYPE_CHECKING
+
+from gamenacki.lostcitinacki.models.compact import (COLOR_BITS, DUPLICATE_HANDSHAKES_MASK, EXPEDITION_POINTS,
+                                                     SLOTS_PER_COLOR, CompactMove, CompactState, board_points,
+                                                     codes_of, mask_add)
+
+if TYPE_CHECKING:
+    from gamenacki.lostcitinacki.ismcts import InformationSet
+
+EXACT, LOWER, UPPER = 0, 1, 2
+INFINITY = 10 ** 6
+DEAD = 255  # stands in for every dead card in a table key's deck & discard
+DEADLINE_CHECK_NODES = 1024
+NEW_EXPEDITION_PENALTY = 20
+
+
+class EndgameSolver:
+    """Solves determinizations for p_idx. Table entries key on whole states, so they stay valid across solve calls;
+    the table is cleared once it holds more than max_entries"""
+
+    def __init__(self, p_idx: int, max_entries: int = 2_000_000):
+        self.p_idx = p_idx
+        self.max_entries = max_entries
+        self.table: dict[tuple, tuple[int, int, CompactMove | None]] = {}
+        self.nodes = 0
+        self._dead_tables: dict[int, bytes] = {}
+        self._deadline = math.inf
+
+    def solve(self, cs: CompactState, deadline: float = math.inf) -> tuple[int, CompactMove | None]:
+        """p_idx's margin with best play by everyone, & the best move for the player to move (None at round end).
+        Raises TimeoutError once time.perf_counter() passes deadline"""
+        if len(self.table) > self.max_entries:
+            self.table.clear()
+        self._deadline = deadline
+        cs = cs.copy()
+        if cs.is_round_over:
+            return self._margin(cs), None
+        # the root is always searched: a table entry may come from a state with other dead cards, so its move may
+        # not be in this hand
+        return self._search_moves(cs, -INFINITY, INFINITY, None)
+
+    def _margin(self, cs: CompactState) -> int:
+        points = [board_points(board) for board in cs.boards]
+        return points[self.p_idx] - max(p for i, p in enumerate(points) if i != self.p_idx)
+
+    def _search(self, cs: CompactState, alpha: int, beta: int) -> tuple[int, CompactMove | None]:
+        self.nodes += 1
+        if not self.nodes % DEADLINE_CHECK_NODES and time.perf_counter() > self._deadline:
+            raise TimeoutError(f"The endgame was not solved in time ({self.nodes} nodes)")
+        if cs.is_round_over:
+            return self._margin(cs), None
+        key = self._key(cs)
+        entry = self.table.get(key)
+        tt_move = None
+        if entry is not None:
+            value, flag, tt_move = entry
+            if flag == EXACT or (flag == LOWER and value >= beta) or (flag == UPPER and value <= alpha):
+                return value, tt_move
+        best_value, best = self._search_moves(cs, alpha, beta, tt_move)
+        flag = UPPER if best_value <= alpha else LOWER if best_value >= beta else EXACT
+        self.table[key] = best_value, flag, best
+        return best_value, best
+
+    def _key(self, cs: CompactState) -> tuple:
+        """The state with its dead cards made alike: counted in hands & a shared code in the deck & discard"""
+        live = cs.playable_mask
+        dead_code = self._dead_tables.get(live)
+        if dead_code is None:
+            dead_code = self._dead_tables[live] = bytes(code if live >> code & 1 else DEAD for code in range(256))
+        return (*(h & live for h in cs.hands), *((h & ~live).bit_count() for h in cs.hands), *cs.boards,
+                bytes(cs.deck.translate(dead_code)), bytes(cs.discard.translate(dead_code)), cs.turn_idx)
+
+    def _search_moves(self, cs: CompactState, alpha: int, beta: int,
+                      first: CompactMove | None) -> tuple[int, CompactMove | None]:
+        maximizing = cs.turn_idx == self.p_idx
+        best_value, best = (-INFINITY if maximizing else INFINITY), None
+        for i, move in enumerate(ordered_moves(cs, first)):
+            token = cs.apply(move)
+            if i == 0:
+                value = self._search(cs, alpha, beta)[0]
+            elif maximizing:
+                value = self._search(cs, alpha, alpha + 1)[0]
+                if alpha < value < beta:
+                    value = self._search(cs, value, beta)[0]
+            else:
+                value = self._search(cs, beta - 1, beta)[0]
+                if alpha < value < beta:
+                    value = self._search(cs, alpha, value)[0]
+            cs.undo(token)
+            if maximizing:
+                if value > best_value:
+                    best_value, best = value, move
+                    alpha = max(alpha, value)
+            elif value < best_value:
+                best_value, best = value, move
+                beta = min(beta, value)
+            if alpha >= beta:
+                break
+        return best_value, best
+
+
+def _play_gain(byte: int, slot: int) -> int:
+    try:
+        added = mask_add(byte, slot)
+    except ValueError:
+        return 0
+    return EXPEDITION_POINTS[added] - EXPEDITION_POINTS[byte] - (NEW_EXPEDITION_PENALTY if not byte else 0)
+
+
+# PLAY_GAIN[color byte][slot]: how good playing the slot's card onto an expedition looks, for move ordering
+PLAY_GAIN: tuple[tuple[int, ...], ...] = tuple(tuple(_play_gain(byte, slot) for slot in range(SLOTS_PER_COLOR))
+                                               for byte in range(1 << SLOTS_PER_COLOR))
+
+
+def ordered_moves(cs: CompactState, first: CompactMove | None = None) -> list[CompactMove]:
+    """legal_moves, likeliest best first: `first` (ex: the table's move), then expedition plays by the points they
+    add, then discards; drawing a playable discard is tried before the deck. A card under its color's max is dead
+    for every player & any dead card does what another does, so only one dead card's discard is kept"""
+    if cs.is_round_over:
+        return []
+    board = cs.boards[cs.turn_idx]
+    hand = cs.hands[cs.turn_idx] & ~DUPLICATE_HANDSHAKES_MASK
+    live = cs.playable_mask
+    can_draw_discard = bool(cs.discard)
+    discard_bonus = 5 if can_draw_discard and live >> cs.discard[-1] & 1 else -5
+    scored = []
+    for code in codes_of(hand & live):
+        slot = code % SLOTS_PER_COLOR
+        gain = PLAY_GAIN[board >> (code - slot) & COLOR_BITS][slot]
+        scored.append((gain, (code, False, False)))
+        if can_draw_discard:
+            scored.append((gain + discard_bonus, (code, False, True)))
+        scored.append((-50, (code, True, False)))
+    dead = hand & ~live
+    if dead:
+        scored.append((-20, ((dead & -dead).bit_length() - 1, True, False)))
+    scored.sort(key=itemgetter(0), reverse=True)
+    moves = [move for _, move in scored]
+    if first is not None and first in moves:
+        moves.remove(first)
+        moves.insert(0, first)
+    return moves
+
+
+def endgame_move(info_set: "InformationSet", samples: int, rng: random.Random, time_limit_ms: float | None = None,
+                 solver: EndgameSolver | None = None) -> CompactMove | None:
+    """The move that is best in the most of up to `samples` solved determinizations of info_set, ties going to the
+    higher mean value; None if time_limit_ms ran out before one was solved"""
+    solver = solver or EndgameSolver(info_set.p_idx)
+    deadline = time.perf_counter() + time_limit_ms / 1000 if time_limit_ms else math.inf
+    votes: dict[CompactMove, tuple[int, int]] = {}
+    for _ in range(samples):
+        try:
+            value, move = solver.solve(info_set.sample(rng), deadline)
+        except TimeoutError:
+            break
+        wins, total = votes.get(move, (0, 0))
+        votes[move] = wins + 1, total + value
+    return max(votes, key=votes.get) if votes else None
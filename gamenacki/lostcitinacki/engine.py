@@ -1,56 +1,196 @@
-import time
 from dataclasses import dataclass, field
+from enum import Enum, auto
+import random
+import time
+from typing import Generator
 
 from gamenacki.common.base_renderer import Renderer
-from gamenacki.common.log import Log, Event
+from gamenacki.common.log import Log, Event, LogLevel
 from gamenacki.common.piles import Discard
+from gamenacki.common.profiler import Profiler
+from gamenacki.common.rng import spawn
 
-from gamenacki.lostcitinacki.models.constants import Color, DrawFromStack, Action
+from gamenacki.lostcitinacki.models.changes import game_ended, round_ended, round_started, turn_changes
+from gamenacki.lostcitinacki.models.cards import Card
+from gamenacki.lostcitinacki.models.constants import Color, DrawFromStack, Action, PlayToStack
 from gamenacki.lostcitinacki.models.game_state import GameState
 from gamenacki.lostcitinacki.players import Player
 
 
+class Step(Enum):
+    """What LostCitiesCore._steps needs from a driver; each is yielded as a tuple of the Step & its arguments"""
+    PLAY_CARD = auto()  # turn_idx; answered with the player's (card, play to)
+    PICK_UP = auto()  # turn_idx, when the discard may be drawn from; answered with the player's DrawFromStack
+    RENDER = auto()
+    CHANGES = auto()  # the changes for the renderer's apply_changes
+    ERROR = auto()  # the exception raised during the turn
+    PAUSE = auto()  # seconds to wait between rounds
+    RENDER_LOG = auto()
+
+
+_STEP_PHASES = {Step.PLAY_CARD: 'decide', Step.PICK_UP: 'decide', Step.RENDER: 'render', Step.CHANGES: 'render'}
+
+
 @dataclass
-class LostCities:
-    players: list[Player]
-    renderer: Renderer
+class LostCitiesCore:
+    """What LostCities & async_engine.AsyncLostCities share: seeding, logging & the sequence of turns & rounds, as
+    _steps. The engines drive it, making the calls to players & renderers blocking or awaited"""
+    players: list
+    renderer: object
     gs: GameState = None
     log: Log = field(default_factory=Log)
     max_rounds: int = 3
+    round_pause: float = 2
+    seed: int | None = None
+    profiler: Profiler | None = None
+    # turns taken in each round so far, counted whatever the Log's level
+    turn_cnts: list[int] = field(default_factory=list, init=False, repr=False)
 
     def __post_init__(self):
-        self.gs = GameState.create_game_state(self.player_cnt, self.max_rounds)
-        self.log.push(Event(self.gs, Action.BEGIN_GAME))
+        """With a seed, the game & its players draw from streams derived from it, & the global random is untouched"""
+        self.gs = GameState.create_game_state(self.player_cnt, self.max_rounds, self._seed_players())
+        self.gs.profiler = self.profiler
+        self._log_begin_game()
+
+    def _seed_players(self) -> random.Random | None:
+        """Offers each player its stream of the seed; returns the game's stream, or None when unseeded"""
+        if self.seed is None:
+            return None
+        for p in self.players:
+            p.use_rng(spawn(self.seed, 'player', p.idx))
+        return spawn(self.seed, 'game')
+
+    def _log_begin_game(self) -> None:
+        self._log(LogLevel.ROUNDS, Action.BEGIN_GAME, attributes={'seed': self.seed, 'max_rounds': self.max_rounds})
 
     @property
     def player_cnt(self) -> int:
         return len(self.players)
 
-    def play(self) -> None:
+    def _log(self, level: LogLevel, action: Action, player_idx: int | None = None,
+             attributes: dict | None = None) -> None:
+        """Snapshots the GameState into an Event only when the Log's level takes it"""
+        if self.log.enabled(level):
+            self.log.push(Event(self.gs.snapshot(), action, player_idx, attributes or {}))
+
+    def _phase(self, name: str, fn, *args):
+        """fn(*args), timed into the profiler's phase `name` when there is a profiler"""
+        if self.profiler is None:
+            return fn(*args)
+        with self.profiler.phase(name):
+            return fn(*args)
+
+    def _play_card(self, turn_idx: int, c: Card, play_to: PlayToStack) -> bool:
+        """Plays & logs the card; returns whether the player may then draw from the discard"""
+        color_or_discard: Color | Discard = self._phase('play_card_to', self.gs.play_card_to, turn_idx, c, play_to)
+        self._phase('log', self._log, LogLevel.ACTIONS, Action.PLAY_CARD, turn_idx, {'card': c, 'play_to': play_to})
+        return not isinstance(color_or_discard, Discard) and len(self.gs.piles.discard) > 0
+
+    def _draw(self, turn_idx: int, drawing_from: DrawFromStack) -> None:
+        self._phase('draw_from', self.gs.draw_from, turn_idx, drawing_from)
+        self.turn_cnts[-1] += 1
+        self._phase('log', self._log, LogLevel.ACTIONS, Action.PICKUP_CARD, turn_idx, {'draw_from': drawing_from})
+
+    def _end_round(self) -> None:
+        self._phase('assign_points', self.gs.assign_points)
+        self._phase('log', self._log, LogLevel.ROUNDS, Action.END_ROUND)
+
+    def _begin_round(self, new_round: bool = True) -> None:
+        """Deals the next round (unless it is the game's first, dealt with the GameState) & logs its start"""
+        if new_round:
+            self._phase('create_new_round', self.gs.create_new_round)
+        self.turn_cnts.append(0)
+        self._phase('log', self._log, LogLevel.ROUNDS, Action.BEGIN_ROUND)
+
+    def _end_game(self) -> None:
+        self._phase('log', self._log, LogLevel.ROUNDS, Action.END_GAME)
+
+    def _steps(self) -> Generator[tuple, object, None]:
+        """The game's sequence of turns & rounds, yielding a (Step, *args) whenever a player or the renderer is
+        needed. A driver runs each step & sends back its answer: the (card, play to) for PLAY_CARD, the draw for
+        PICK_UP, None otherwise; an exception raised by a step is thrown in instead. An exception during a turn is
+        yielded as an ERROR step & the turn is taken again, as is the turn's player"""
+        diffs = self.renderer.wants_changes
+        if diffs:
+            yield Step.CHANGES, round_started(self.gs)
+        self._begin_round(new_round=False)
         while not self.gs.is_game_over:
-            self.log.push(Event(self.gs, Action.BEGIN_ROUND))
-            self.renderer.render(self.gs, self.players)
+            if not diffs:
+                yield Step.RENDER,
             turn_idx = self.gs.dealer.player_turn_idx
-            player = self.players[turn_idx]
             try:
-                selected_card, play_to_stack = player.play_card(self.gs.piles.hands[turn_idx], self.gs.board_playable_cards)
-                color_or_discard: Color | Discard = self.gs.play_card_to(turn_idx, selected_card, play_to_stack)
-                self.log.push(Event(self.gs, Action.PLAY_CARD, turn_idx))
-                can_pick_up_discard: bool = not isinstance(color_or_discard, Discard) and len(self.gs.piles.discard) > 0
-                drawing_from: DrawFromStack = player.pick_up_from(can_pick_up_discard, self.gs.is_discard_card_playable)
-                self.gs.draw_from(turn_idx, drawing_from)
-                self.log.push(Event(self.gs, Action.PICKUP_CARD, turn_idx))
-
+                selected_card, play_to_stack = yield Step.PLAY_CARD, turn_idx
+                drawing_from = DrawFromStack.DECK
+                if self._play_card(turn_idx, selected_card, play_to_stack):
+                    drawing_from = yield Step.PICK_UP, turn_idx
+                self._draw(turn_idx, drawing_from)
+                if diffs:
+                    yield Step.CHANGES, turn_changes(self.gs, turn_idx, selected_card, play_to_stack, drawing_from)
             except Exception as ex:
-                self.renderer.render_error(ex)
+                yield Step.ERROR, ex
 
             if self.gs.is_round_over:
-                self.gs.assign_points()
-                self.renderer.render(self.gs, self.players)
-                self.log.push(Event(self.gs, Action.END_ROUND))
-                time.sleep(2)
-                self.gs.create_new_round()
-
-        self.renderer.render(self.gs, self.players)
-        self.log.push(Event(self.gs, Action.END_GAME))
-        self.renderer.render_log(self.log)
+                self._end_round()
+                yield (Step.CHANGES, round_ended(self.gs)) if diffs else (Step.RENDER,)
+                if self.gs.is_game_over:
+                    break
+                if self.round_pause:
+                    yield Step.PAUSE, self.round_pause
+                self._begin_round()
+                if diffs:
+                    yield Step.CHANGES, round_started(self.gs)
+
+        yield (Step.CHANGES, game_ended(self.gs)) if diffs else (Step.RENDER,)
+        self._end_game()
+        yield Step.RENDER_LOG,
+
+
+@dataclass
+class LostCities(LostCitiesCore):
+    players: list[Player]
+    renderer: Renderer
+
+    def play(self) -> None:
+        """A renderer with wants_changes gets apply_changes where others get render.
+        With a profiler, each phase of a turn is timed: decide, play_card_to, draw_from, assign_points,
+        create_new_round, render & log"""
+        run = self._run if self.profiler is None else self._run_profiled
+        steps = self._steps()
+        reply, error = None, None
+        while True:
+            try:
+                step = steps.throw(error) if error is not None else steps.send(reply)
+            except StopIteration:
+                return
+            reply, error = None, None
+            try:
+                reply = run(step)
+            except Exception as ex:
+                error = ex
+
+    def _run_profiled(self, step: tuple):
+        name = _STEP_PHASES.get(step[0])
+        if name is None:
+            return self._run(step)
+        with self.profiler.phase(name):
+            return self._run(step)
+
+    def _run(self, step: tuple):
+        kind = step[0]
+        if kind == Step.PLAY_CARD:
+            turn_idx = step[1]
+            player = self.players[turn_idx]
+            player.observe(self.gs)
+            return player.play_card(self.gs.piles.hands[turn_idx], self.gs.board_playable_cards)
+        if kind == Step.PICK_UP:
+            return self.players[step[1]].pick_up_from(True, self.gs.is_discard_card_playable)
+        if kind == Step.RENDER:
+            self.renderer.render(self.gs, self.players)
+        elif kind == Step.CHANGES:
+            self.renderer.apply_changes(self.gs, self.players, step[1])
+        elif kind == Step.ERROR:
+            self.renderer.render_error(step[1])
+        elif kind == Step.PAUSE:
+            time.sleep(step[1])
+        elif kind == Step.RENDER_LOG:
+            self.renderer.render_log(self.log)
@@ -0,0 +1,266 @@
+"""A Player that chooses moves with single-observer information-set Monte Carlo tree search (SO-ISMCTS).
+
+Every iteration samples a determinization of what the player cannot see (the opponent's hand & the deck order),
+walks & grows one shared tree using only the moves legal in that sample, then finishes the round with a fast
+default policy over CompactState. Rewards are the round's point margin, so the search plays for the current round.
+
+Example usage:
+    LostCities([ConsolePlayer(0, 'Nacki'), ISMCTSPlayer(1, 'TreeBot', rollouts=2000)], ConsoleRenderer()).play()
+"""
+
+from dataclasses import dataclass, field
+import math
+import random
+import time
+from typing import TYPE_CHECKING
+
+from gamenacki.common.eval_cache import EvalCache
+from gamenacki.common.piles import Hand
+from gamenacki.lostcitinacki.endgame import endgame_move
+from gamenacki.lostcitinacki.models.cards import Card
+from gamenacki.lostcitinacki.models.compact import (CARD_CNT, COLOR_BITS, DUPLICATE_HANDSHAKES_MASK, SLOTS_PER_COLOR,
+                                                     CompactMove, CompactState, codes_of, encode, mask_add)
+from gamenacki.lostcitinacki.models.constants import DrawFromStack, PlayToStack
+from gamenacki.lostcitinacki.models.game_state import GameState
+from gamenacki.lostcitinacki.models.piles import FULL_DECK
+from gamenacki.lostcitinacki.players import Player
+
+if TYPE_CHECKING:
+    from gamenacki.lostcitinacki.rollout_pool import RolloutPool
+    from gamenacki.lostcitinacki.tracker import HandTracker
+
+MAX_ROLLOUT_TURNS = 200
+REWARD_SCALE = 100
+FULL_DECK_CODES: tuple[int, ...] = tuple(encode(c) for c in FULL_DECK)
+
+
+@dataclass(slots=True)
+class InformationSet:
+    """What p_idx knows: state holds the public piles & p_idx's hand (other hands & the deck are left empty);
+    unseen holds the codes of every card p_idx has not seen, & known the codes each other hand is known to hold"""
+    state: CompactState
+    p_idx: int
+    unseen: list[int]
+    hand_sizes: list[int]
+    deck_size: int
+    known: list[list[int]] = field(default_factory=list)
+
+    @classmethod
+    def from_game_state(cls, gs: GameState, p_idx: int) -> "InformationSet":
+        state = CompactState.from_game_state(gs)
+        counts = [0] * CARD_CNT
+        for code in FULL_DECK_CODES:
+            counts[code] += 1
+        seen = [*gs.piles.hands[p_idx], *gs.piles.discard, *(c for board in gs.piles.exp_boards for exp in board
+                                                              for c in exp)]
+        for c in seen:
+            counts[encode(c)] -= 1
+        hand_sizes = [len(h) for h in gs.piles.hands]
+        state.hands = [h if i == p_idx else 0 for i, h in enumerate(state.hands)]
+        deck_size, state.deck = len(state.deck), bytearray()
+        return cls(state, p_idx, [code for code, n in enumerate(counts) for _ in range(n)], hand_sizes, deck_size)
+
+    @classmethod
+    def from_tracker(cls, gs: GameState, tracker: "HandTracker") -> "InformationSet":
+        """Takes unseen & known cards from a HandTracker kept by the Log, instead of walking the piles for them.
+        Raises ValueError when the tracker is behind the game, ex: when it is not a listener of the game's Log"""
+        if tracker.deck_size != len(gs.piles.deck) or tracker.hand_sizes != [len(h) for h in gs.piles.hands]:
+            raise ValueError(f"the HandTracker for player {tracker.p_idx} is behind the game; "
+                             f"is it a listener of the game's Log?")
+        state = CompactState.from_game_state(gs)
+        state.hands = [h if i == tracker.p_idx else 0 for i, h in enumerate(state.hands)]
+        state.deck = bytearray()
+        return cls(state, tracker.p_idx, tracker.unseen_codes(), list(tracker.hand_sizes), tracker.deck_size,
+                   [tracker.known_codes(i) for i in range(len(tracker.hand_sizes))])
+
+    def sample(self, rng: random.Random) -> CompactState:
+        """A determinization: the known cards put in their hands, & the unseen cards dealt at random to the rest of
+        the other hands & the deck"""
+        cs = self.state.copy()
+        pool = self.unseen[:]
+        rng.shuffle(pool)
+        start = 0
+        for p_idx, size in enumerate(self.hand_sizes):
+            if p_idx == self.p_idx:
+                continue
+            mask = 0
+            known = self.known[p_idx] if self.known else ()
+            for code in known:
+                mask = mask_add(mask, code)
+            unknown_cnt = size - len(known)
+            for code in pool[start:start + unknown_cnt]:
+                mask = mask_add(mask, code)
+            cs.hands[p_idx] = mask
+            start += unknown_cnt
+        cs.deck = bytearray(pool[start:])
+        return cs
+
+    def key(self) -> tuple:
+        """Equal for any two positions p_idx cannot tell apart: its hand, the public piles, the turn & pile sizes, &
+        the cards known to be in other hands"""
+        state = self.state
+        return (self.p_idx, state.hands[self.p_idx], tuple(state.boards), bytes(state.discard), state.turn_idx,
+                self.deck_size, tuple(self.hand_sizes), tuple(tuple(sorted(codes)) for codes in self.known))
+
+
+def default_policy(cs: CompactState, rng: random.Random) -> CompactMove:
+    """Extends started expeditions with their lowest playable card, sometimes starts a new one, else discards an
+    unplayable card; draws the discard only when its top card is playable"""
+    p_idx = cs.turn_idx
+    hand = cs.hands[p_idx] & ~DUPLICATE_HANDSHAKES_MASK
+    playable = hand & cs.playable_mask
+    board = cs.boards[p_idx]
+    started = 0
+    for shift in range(0, CARD_CNT, SLOTS_PER_COLOR):
+        if board >> shift & COLOR_BITS:
+            started |= COLOR_BITS << shift
+    candidates = playable & started
+    if not candidates and playable and rng.random() < 0.5:
+        candidates = playable
+    if candidates:
+        code = rng.choice(codes_of(candidates))
+        color_candidates = candidates & COLOR_BITS << (code - code % SLOTS_PER_COLOR)
+        code = (color_candidates & -color_candidates).bit_length() - 1
+        return code, False, bool(cs.discard) and cs.is_playable(cs.discard[-1])
+    return rng.choice(codes_of(hand & ~playable or hand)), True, False
+
+
+def margin(cs: CompactState, p_idx: int) -> int:
+    """p_idx's round points less the best of the other players'"""
+    points = [cs.points(i) for i in range(cs.player_cnt)]
+    return points[p_idx] - max(p for i, p in enumerate(points) if i != p_idx)
+
+
+def rollout(cs: CompactState, rng: random.Random) -> CompactState:
+    """Plays the round out in place with default_policy"""
+    turns = 0
+    while not cs.is_round_over and turns < MAX_ROLLOUT_TURNS:
+        cs.apply(default_policy(cs, rng))
+        turns += 1
+    return cs
+
+
+class _Node:
+    __slots__ = ('move', 'parent', 'mover', 'children', 'visits', 'reward', 'avails')
+
+    def __init__(self, move: CompactMove | None = None, parent: "_Node | None" = None, mover: int | None = None):
+        self.move = move
+        self.parent = parent
+        self.mover = mover
+        self.children: dict[CompactMove, _Node] = {}
+        self.visits = 0
+        self.reward = 0.0
+        self.avails = 1
+
+    def ucb(self, exploration: float) -> float:
+        return self.reward / self.visits + exploration * math.sqrt(math.log(self.avails) / self.visits)
+
+
+def search(info_set: InformationSet, rollouts: int, time_limit_ms: float | None = None, exploration: float = 0.7,
+           rng: random.Random | None = None) -> dict[CompactMove, tuple[int, float]]:
+    """Runs up to `rollouts` iterations, stopping early when time_limit_ms has passed.
+    Returns root statistics: move -> (visits, total reward), rewards being point margins / REWARD_SCALE"""
+    rng = rng or random.Random()
+    deadline = time.perf_counter() + time_limit_ms / 1000 if time_limit_ms else math.inf
+    root = _Node()
+    for i in range(rollouts):
+        if i % 16 == 0 and time.perf_counter() > deadline:
+            break
+        cs = info_set.sample(rng)
+        node = root
+        while not cs.is_round_over:
+            legal = cs.legal_moves()
+            untried = [m for m in legal if m not in node.children]
+            for m in legal:
+                if m in node.children:
+                    node.children[m].avails += 1
+            if untried:
+                move = rng.choice(untried)
+                node.children[move] = node = _Node(move, node, cs.turn_idx)
+                cs.apply(move)
+                break
+            node = max((node.children[m] for m in legal), key=lambda child: child.ucb(exploration))
+            cs.apply(node.move)
+
+        rollout(cs, rng)
+        margins = [margin(cs, p_idx) / REWARD_SCALE for p_idx in range(cs.player_cnt)]
+        while node is not None:
+            node.visits += 1
+            if node.mover is not None:
+                node.reward += margins[node.mover]
+            node = node.parent
+    return {move: (child.visits, child.reward) for move, child in root.children.items()}
+
+
+def best_move(root_stats: dict[CompactMove, tuple[int, float]]) -> CompactMove:
+    """The most visited move, ties broken by total reward"""
+    return max(root_stats, key=lambda m: root_stats[m])
+
+
+@dataclass
+class ISMCTSPlayer(Player):
+    """Stops after `rollouts` iterations or time_limit_ms milliseconds per move, whichever comes first.
+    With a pool, the rollouts are split across its worker processes.
+    With a tracker for its seat, listening to the game's Log, determinizations keep the cards the opponent is known
+    to hold. Once the deck is down to endgame_deck_size cards, moves come from solving endgame_samples
+    determinizations exactly (see endgame.py) instead, falling back to the search if none is solved within
+    endgame_time_limit_ms. Solves are quick up to a deck of about 6, but at 8 some take over 10 s (see endgame.py), so a
+    larger endgame_deck_size mostly spends its time limit & falls back. With a cache (ex: eval_cache.SHARED_CACHE), a move chosen once is replayed whenever this
+    seat faces the same information set again, for any player with the same search settings"""
+    rollouts: int = 1000
+    time_limit_ms: float | None = None
+    exploration: float = 0.7
+    seed: int | None = None
+    pool: "RolloutPool | None" = field(default=None, repr=False, compare=False)
+    tracker: "HandTracker | None" = field(default=None, repr=False, compare=False)
+    endgame_deck_size: int = 4
+    endgame_samples: int = 8
+    endgame_time_limit_ms: float | None = 500
+    cache: EvalCache | None = field(default=None, repr=False, compare=False)
+    _gs: GameState | None = field(default=None, init=False, repr=False)
+    _draw_from: DrawFromStack = field(default=DrawFromStack.DECK, init=False, repr=False)
+    _rng: random.Random = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def use_rng(self, rng: random.Random) -> None:
+        if self.seed is None:
+            self._rng = rng
+
+    def observe(self, gs: GameState) -> None:
+        self._gs = gs
+
+    @property
+    def settings(self) -> tuple:
+        """Everything besides the information set that changes which move the search picks"""
+        return (self.rollouts, self.time_limit_ms, self.exploration, self.endgame_deck_size, self.endgame_samples,
+                self.endgame_time_limit_ms, self.tracker is not None)
+
+    def choose_move(self, gs: GameState) -> CompactMove:
+        info_set = (InformationSet.from_tracker(gs, self.tracker) if self.tracker is not None
+                    else InformationSet.from_game_state(gs, self.idx))
+        if self.cache is None:
+            return self._search_move(info_set)
+        key = ('ismcts', info_set.key(), self.settings)
+        return self.cache.get_or_compute(key, lambda: self._search_move(info_set))
+
+    def _search_move(self, info_set: InformationSet) -> CompactMove:
+        if info_set.deck_size <= self.endgame_deck_size:
+            move = endgame_move(info_set, self.endgame_samples, self._rng, self.endgame_time_limit_ms)
+            if move is not None:
+                return move
+        if self.pool is not None:
+            return best_move(self.pool.search(info_set, self.rollouts, self.time_limit_ms, self.exploration))
+        return best_move(search(info_set, self.rollouts, self.time_limit_ms, self.exploration, self._rng))
+
+    def play_card(self, h: Hand, board_playable_cards: list[Card]) -> tuple[Card, PlayToStack]:
+        if self._gs is None:
+            raise ValueError("ISMCTSPlayer must observe the GameState before playing")
+        code, to_discard, from_discard = self.choose_move(self._gs)
+        self._draw_from = DrawFromStack.DISCARD if from_discard else DrawFromStack.DECK
+        card = next(c for c in h if encode(c) == code)
+        return card, PlayToStack.DISCARD if to_discard else PlayToStack.EXPEDITION
+
+    def _child_pick_up_from(self, is_discard_card_playable: bool) -> DrawFromStack:
+        return self._draw_from
@@ -0,0 +1,150 @@
+"""A load generator for the game server: many clients play games concurrently & report games/s & move latency.
+
+Each client keeps only what the deltas tell it (its hand, the discard & the color maxes) & plays like BotPlayer.
+A move's latency runs from sending it to the server's next turn message, so it includes the bot's reply.
+Without a port, a server is started in this process; note that it then shares the CPU with the clients.
+
+Example usage:
+    python -m gamenacki.lostcitinacki.load_client --clients 200 --games 5
+"""
+
+import argparse
+import asyncio
+from dataclasses import dataclass
+import json
+import random
+import time
+
+from gamenacki.lostcitinacki.models.compact import SLOTS_PER_COLOR, VALUES, is_playable
+from gamenacki.lostcitinacki.server import SessionPool, send, start_server
+
+
+@dataclass(frozen=True)
+class LoadReport:
+    clients: int
+    games: int
+    moves: int
+    seconds: float
+    p50_ms: float
+    p99_ms: float
+
+    @property
+    def games_per_s(self) -> float:
+        return self.games / self.seconds
+
+    def __str__(self) -> str:
+        return (f"{self.games} games by {self.clients} clients in {self.seconds:.2f}s: {self.games_per_s:.1f} games/s, "
+                f"{self.moves} moves, p50 {self.p50_ms:.2f}ms, p99 {self.p99_ms:.2f}ms")
+
+
+def _percentile(latencies: list[float], fraction: float) -> float:
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000 if ordered else 0.0
+
+
+class _ClientGame:
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.hand: list[int] = []
+        self.discard: list[int] = []
+        self.color_maxes = [0] * (len(VALUES) // SLOTS_PER_COLOR)
+
+    def deal(self, hand: list[int]) -> None:
+        self.hand, self.discard = hand, []
+        self.color_maxes = [0] * len(self.color_maxes)
+
+    def is_playable(self, code: int) -> bool:
+        return is_playable(self.color_maxes, code)
+
+    def apply(self, message: dict, you: int) -> None:
+        if message['t'] == 'play':
+            code = message['card']
+            if message['p'] == you:
+                self.hand.remove(code)
+            if message['discard']:
+                self.discard.append(code)
+            else:
+                color_idx = code // SLOTS_PER_COLOR
+                self.color_maxes[color_idx] = max(self.color_maxes[color_idx], VALUES[code])
+        elif message['t'] == 'draw':
+            if message['discard']:
+                self.discard.pop()
+            if message['p'] == you:
+                self.hand.append(message['card'])
+
+    def choose(self) -> dict:
+        playable = [code for code in self.hand if self.is_playable(code)]
+        if not playable:
+            return {'card': self.rng.choice(self.hand), 'discard': True, 'draw_discard': False}
+        draw_discard = bool(self.discard) and self.is_playable(self.discard[-1]) and self.rng.random() < 0.8
+        return {'card': self.rng.choice(playable), 'discard': False, 'draw_discard': draw_discard}
+
+
+async def run_client(host: str, port: int, game_cnt: int, latencies: list[float], seed: int | None = None) -> int:
+    """Plays game_cnt games, appending each move's latency in seconds; returns the number of moves"""
+    reader, writer = await asyncio.open_connection(host, port)
+    game, you, games_played, move_cnt, sent_at = _ClientGame(random.Random(seed)), 0, 0, 0, None
+    try:
+        while games_played < game_cnt:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("The server closed the connection")
+            message = json.loads(line)
+            if message['t'] == 'turn':
+                if sent_at is not None:
+                    latencies.append(time.perf_counter() - sent_at)
+                send(writer, game.choose())
+                sent_at = time.perf_counter()
+                move_cnt += 1
+            elif message['t'] == 'deal':
+                you = message['you']
+                game.deal(message['hand'])
+                sent_at = None
+            elif message['t'] == 'game_end':
+                games_played += 1
+            elif message['t'] == 'error':
+                raise ValueError(f"The server refused a move: {message['msg']}")
+            else:
+                game.apply(message, you)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return move_cnt
+
+
+async def load_test(host: str = '127.0.0.1', port: int | None = None, client_cnt: int = 100,
+                    games_per_client: int = 5, seed: int | None = None) -> LoadReport:
+    server, pool = None, SessionPool()
+    if port is None:
+        server = await start_server(host, 0, pool)
+        port = server.sockets[0].getsockname()[1]
+    seeder = random.Random(seed)
+    latencies: list[float] = []
+    start = time.perf_counter()
+    try:
+        move_cnts = await asyncio.gather(*(run_client(host, port, games_per_client, latencies, seeder.getrandbits(64))
+                                           for _ in range(client_cnt)))
+        seconds = time.perf_counter() - start
+    finally:
+        if server is not None:
+            while pool.in_use_cnt:
+                await asyncio.sleep(0.01)
+            server.close()
+            await server.wait_closed()
+    return LoadReport(client_cnt, client_cnt * games_per_client, sum(move_cnts), seconds,
+                      _percentile(latencies, 0.5), _percentile(latencies, 0.99))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play many games against a Lost Cities server at once")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, help="a running server's port; without it, one is started here")
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--games', type=int, default=5, help="games per client")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+    print(asyncio.run(load_test(args.host, args.port, args.clients, args.games, args.seed)))
+
+
+if __name__ == '__main__':
+    main()
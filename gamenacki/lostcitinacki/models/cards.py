@@ -3,13 +3,13 @@ from dataclasses import dataclass
 from gamenacki.lostcitinacki.models.constants import Color
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Card:
     color: Color
     value: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Handshake(Card):
     value: int = 0
 
@@ -17,7 +17,12 @@ class Handshake(Card):
         return f'{self.color[0].upper()}H'
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExpeditionCard(Card):
     def __repr__(self) -> str:
         return f'{self.color[0].upper()}{self.value}'
+
+
+# every deck, hand & pile holds these 40 immutable flyweights; no card is created after import
+DECK_CARDS: tuple[Card, ...] = (*(Handshake(c) for c in Color for _ in range(3)),
+                                *(ExpeditionCard(c, v) for c in Color for v in range(6, 11)))
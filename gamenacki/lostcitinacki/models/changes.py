@@ -0,0 +1,84 @@
+"""Typed change events: what a turn or round changed, for renderers that update instead of redrawing.
+
+The engine only builds these for a renderer whose wants_changes is True, & hands them to its apply_changes.
+"""
+
+from dataclasses import dataclass
+
+from gamenacki.lostcitinacki.models.cards import Card
+from gamenacki.lostcitinacki.models.constants import DrawFromStack, PlayToStack
+
+
+@dataclass(frozen=True, slots=True)
+class RoundStarted:
+    """Hands have been dealt; a renderer reads them & anything else it needs from the GameState"""
+    round_number: int
+    dealer_idx: int
+    turn_idx: int
+
+
+@dataclass(frozen=True, slots=True)
+class CardPlayed:
+    """To the expedition of card.color, or to the discard"""
+    player_idx: int
+    card: Card
+    play_to: PlayToStack
+
+
+@dataclass(frozen=True, slots=True)
+class CardDrawn:
+    player_idx: int
+    card: Card
+    draw_from: DrawFromStack
+
+
+@dataclass(frozen=True, slots=True)
+class DiscardTopChanged:
+    top: Card | None
+
+
+@dataclass(frozen=True, slots=True)
+class DeckCountChanged:
+    count: int
+
+
+@dataclass(frozen=True, slots=True)
+class TurnChanged:
+    player_idx: int
+
+
+@dataclass(frozen=True, slots=True)
+class RoundEnded:
+    points: tuple[int, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class GameEnded:
+    totals: tuple[int, ...]
+
+
+Change = (RoundStarted | CardPlayed | CardDrawn | DiscardTopChanged | DeckCountChanged | TurnChanged | RoundEnded
+          | GameEnded)
+
+
+def round_started(gs) -> list[Change]:
+    return [RoundStarted(gs.dealer.current_round_number, gs.dealer.dealer_idx, gs.dealer.player_turn_idx)]
+
+
+def turn_changes(gs, p_idx: int, c: Card, play_to: PlayToStack, draw_from: DrawFromStack) -> list[Change]:
+    """What one turn changed, read from the GameState after the draw"""
+    changes = [CardPlayed(p_idx, c, play_to), CardDrawn(p_idx, gs.piles.hands[p_idx].peek(), draw_from)]
+    if play_to == PlayToStack.DISCARD or draw_from == DrawFromStack.DISCARD:
+        changes.append(DiscardTopChanged(gs.piles.discard.peek()))
+    if draw_from == DrawFromStack.DECK:
+        changes.append(DeckCountChanged(len(gs.piles.deck)))
+    changes.append(TurnChanged(gs.dealer.player_turn_idx))
+    return changes
+
+
+def round_ended(gs) -> list[Change]:
+    return [RoundEnded(tuple(pl.ledger[-1] for pl in gs.scorer.ledgers))]
+
+
+def game_ended(gs) -> list[Change]:
+    return [GameEnded(tuple(pl.total for pl in gs.scorer.ledgers))]
@@ -0,0 +1,260 @@
+"""An optional compact representation of cards & piles, for bots & simulations that need speed over readability.
+
+Every card is a small int code: color_idx * 8 + slot, where slots 0-2 are handshakes & slots 3-7 are the values 6-10.
+Unordered piles (hands, expeditions) are bitmasks over those codes; ordered piles (deck, discard) are bytearrays.
+Handshakes of a color are interchangeable, so within a mask they are counted in unary: k handshakes set slots 0..k-1.
+An ordered pile always stores a handshake as slot 0.
+
+Example usage:
+    cs = CompactState.from_game_state(gs)
+    playable = cs.hands[cs.turn_idx] & cs.playable_mask
+"""
+
+from dataclasses import dataclass
+
+from gamenacki.lostcitinacki.models.cards import Card, Handshake, ExpeditionCard
+from gamenacki.lostcitinacki.models.constants import Color
+from gamenacki.lostcitinacki.models.piles import FULL_DECK
+
+COLORS: list[Color] = list(Color)
+COLOR_IDX: dict[Color, int] = {c: i for i, c in enumerate(COLORS)}
+SLOTS_PER_COLOR = 8
+HANDSHAKE_SLOTS = 3
+CARD_CNT = len(COLORS) * SLOTS_PER_COLOR
+COLOR_BITS = (1 << SLOTS_PER_COLOR) - 1
+HANDSHAKE_BITS = (1 << HANDSHAKE_SLOTS) - 1
+ALL_CARDS_MASK = (1 << CARD_CNT) - 1
+# the 2nd & 3rd handshake slots of every color; masking them off leaves each distinct card once
+DUPLICATE_HANDSHAKES_MASK = sum((HANDSHAKE_BITS & ~1) << (i * SLOTS_PER_COLOR) for i in range(len(COLORS)))
+
+
+def _slot_value(slot: int) -> int:
+    return 0 if slot < HANDSHAKE_SLOTS else slot + 3
+
+
+# interned to the deck's flyweights; a color's handshake slots all decode to its first handshake
+CARDS: tuple[Card, ...] = tuple(next(d for d in FULL_DECK if d == card) for card in (
+    Handshake(c) if slot < HANDSHAKE_SLOTS else ExpeditionCard(c, _slot_value(slot))
+    for c in COLORS for slot in range(SLOTS_PER_COLOR)))
+VALUES: tuple[int, ...] = tuple(c.value for c in CARDS)
+
+
+# encode(c) == COLOR_BASE[c.color] + VALUE_SLOT[c.value]; hot loops may inline it
+COLOR_BASE: dict[Color, int] = {c: i * SLOTS_PER_COLOR for c, i in COLOR_IDX.items()}
+VALUE_SLOT: tuple[int, ...] = tuple(0 if v < 6 else v - 3 for v in range(11))
+
+
+def encode(c: Card) -> int:
+    return COLOR_BASE[c.color] + VALUE_SLOT[c.value]
+
+
+def decode(code: int) -> Card:
+    return CARDS[code]
+
+
+def is_handshake(code: int) -> bool:
+    return code % SLOTS_PER_COLOR < HANDSHAKE_SLOTS
+
+
+def color_idx_of(code: int) -> int:
+    return code // SLOTS_PER_COLOR
+
+
+def mask_add(mask: int, code: int) -> int:
+    if is_handshake(code):
+        base = code - code % SLOTS_PER_COLOR
+        handshakes = (mask >> base) & HANDSHAKE_BITS
+        if handshakes == HANDSHAKE_BITS:
+            raise ValueError(f"{decode(code)} cannot be added; all handshakes are present")
+        return mask | (handshakes + 1) << base
+    if mask >> code & 1:
+        raise ValueError(f"{decode(code)} is already present")
+    return mask | 1 << code
+
+
+def mask_remove(mask: int, code: int) -> int:
+    if is_handshake(code):
+        base = code - code % SLOTS_PER_COLOR
+        handshakes = (mask >> base) & HANDSHAKE_BITS
+        if not handshakes:
+            raise ValueError(f"{decode(code)} not found")
+        return mask & ~(HANDSHAKE_BITS << base) | (handshakes >> 1) << base
+    if not mask >> code & 1:
+        raise ValueError(f"{decode(code)} not found")
+    return mask ^ 1 << code
+
+
+def mask_contains(mask: int, code: int) -> bool:
+    if is_handshake(code):
+        code -= code % SLOTS_PER_COLOR
+    return bool(mask >> code & 1)
+
+
+def mask_of(cards) -> int:
+    mask = 0
+    for c in cards:
+        mask = mask_add(mask, encode(c))
+    return mask
+
+
+def codes_of(mask: int) -> list[int]:
+    codes = []
+    while mask:
+        low_bit = mask & -mask
+        codes.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return codes
+
+
+def cards_of(mask: int) -> list[Card]:
+    return [CARDS[code] for code in codes_of(mask)]
+
+
+def encode_pile(cards) -> bytearray:
+    return bytearray(encode(c) for c in cards)
+
+
+def decode_pile(codes) -> list[Card]:
+    return [CARDS[code] for code in codes]
+
+
+def _color_byte_points(byte: int) -> int:
+    """Expedition.points for one color's 8 bits of an expedition mask"""
+    codes = codes_of(byte)
+    if not codes:
+        return 0
+    handshake_cnt = sum(1 for code in codes if code < HANDSHAKE_SLOTS)
+    bonus = 20 if len(codes) >= 8 else 0
+    return (sum(_slot_value(code) for code in codes) - 20) * (1 + handshake_cnt) + bonus
+
+
+EXPEDITION_POINTS: tuple[int, ...] = tuple(_color_byte_points(b) for b in range(1 << SLOTS_PER_COLOR))
+# PLAYABLE_BITS[color_max] is the slots of one color that may still be played to an expedition
+PLAYABLE_BITS: tuple[int, ...] = tuple(COLOR_BITS if m == 0 else
+                                       sum(1 << slot for slot in range(HANDSHAKE_SLOTS, SLOTS_PER_COLOR)
+                                           if _slot_value(slot) > m)
+                                       for m in range(11))
+
+
+def board_points(mask: int) -> int:
+    """Same result as ExpeditionBoard.points"""
+    return sum(EXPEDITION_POINTS[(mask >> (i * SLOTS_PER_COLOR)) & COLOR_BITS] for i in range(len(COLORS)))
+
+
+def is_playable(color_maxes: list[int], code: int) -> bool:
+    """Whether the card may be played to its expedition, given each color's max"""
+    color_max = color_maxes[color_idx_of(code)]
+    return color_max == 0 or VALUES[code] > color_max
+
+
+def playable_mask(color_maxes: list[int]) -> int:
+    mask = 0
+    for i, color_max in enumerate(color_maxes):
+        mask |= PLAYABLE_BITS[color_max] << (i * SLOTS_PER_COLOR)
+    return mask
+
+
+# (card code, played to discard, drew from discard); the compact counterpart of GameState's Move
+CompactMove = tuple[int, bool, bool]
+# what CompactState.apply returns & CompactState.undo takes: (p_idx, move, previous color max, drawn card code)
+CompactUndoToken = tuple[int, CompactMove, int, int]
+
+
+@dataclass(slots=True)
+class CompactState:
+    """The piles & turn of one round; mirrors GameState.play_card_to & draw_from, with cards as int codes"""
+    hands: list[int]
+    boards: list[int]
+    deck: bytearray
+    discard: bytearray
+    color_maxes: list[int]
+    turn_idx: int
+
+    @classmethod
+    def from_game_state(cls, gs) -> "CompactState":
+        return cls(hands=[mask_of(h) for h in gs.piles.hands],
+                   boards=[mask_of(c for exp in board for c in exp) for board in gs.piles.exp_boards],
+                   deck=encode_pile(gs.piles.deck),
+                   discard=encode_pile(gs.piles.discard),
+                   color_maxes=[gs.color_maxes[c] for c in COLORS],
+                   turn_idx=gs.dealer.player_turn_idx)
+
+    def copy(self) -> "CompactState":
+        return CompactState(self.hands[:], self.boards[:], self.deck[:], self.discard[:], self.color_maxes[:],
+                            self.turn_idx)
+
+    @property
+    def player_cnt(self) -> int:
+        return len(self.hands)
+
+    @property
+    def playable_mask(self) -> int:
+        return playable_mask(self.color_maxes)
+
+    @property
+    def is_round_over(self) -> bool:
+        return not self.deck or all(m == 10 for m in self.color_maxes)
+
+    def is_playable(self, code: int) -> bool:
+        return is_playable(self.color_maxes, code)
+
+    def play(self, p_idx: int, code: int, to_discard: bool) -> None:
+        if to_discard:
+            self.hands[p_idx] = mask_remove(self.hands[p_idx], code)
+            self.discard.append(code - code % SLOTS_PER_COLOR if is_handshake(code) else code)
+            return
+        color, value = color_idx_of(code), VALUES[code]
+        if self.color_maxes[color] > value > 0:
+            raise ValueError(f"You must play higher than a {self.color_maxes[color]}")
+        self.hands[p_idx] = mask_remove(self.hands[p_idx], code)
+        self.boards[p_idx] = mask_add(self.boards[p_idx], code)
+        if value > self.color_maxes[color]:
+            self.color_maxes[color] = value
+
+    def draw(self, p_idx: int, from_discard: bool) -> int:
+        source = self.discard if from_discard else self.deck
+        if not source:
+            raise ValueError("There are no cards here")
+        code = source.pop()
+        self.hands[p_idx] = mask_add(self.hands[p_idx], code)
+        self.turn_idx = (self.turn_idx + 1) % self.player_cnt
+        return code
+
+    def points(self, p_idx: int) -> int:
+        return board_points(self.boards[p_idx])
+
+    def legal_moves(self) -> list[CompactMove]:
+        """The same moves as GameState.legal_moves, ordered by card code"""
+        if self.is_round_over:
+            return []
+        hand = self.hands[self.turn_idx] & ~DUPLICATE_HANDSHAKES_MASK
+        playable = hand & self.playable_mask
+        can_draw_discard = bool(self.discard)
+        moves = []
+        for code in codes_of(hand):
+            if playable >> code & 1:
+                moves.append((code, False, False))
+                if can_draw_discard:
+                    moves.append((code, False, True))
+            moves.append((code, True, False))
+        return moves
+
+    def apply(self, move: CompactMove) -> CompactUndoToken:
+        """Returns a token that undo uses to reverse the move exactly"""
+        code, to_discard, from_discard = move
+        p_idx = self.turn_idx
+        prev_max = self.color_maxes[color_idx_of(code)]
+        self.play(p_idx, code, to_discard)
+        return p_idx, move, prev_max, self.draw(p_idx, from_discard)
+
+    def undo(self, token: CompactUndoToken) -> None:
+        p_idx, (code, to_discard, from_discard), prev_max, drawn = token
+        self.hands[p_idx] = mask_remove(self.hands[p_idx], drawn)
+        (self.discard if from_discard else self.deck).append(drawn)
+        if to_discard:
+            self.discard.pop()
+        else:
+            self.boards[p_idx] = mask_remove(self.boards[p_idx], code)
+            self.color_maxes[color_idx_of(code)] = prev_max
+        self.hands[p_idx] = mask_add(self.hands[p_idx], code)
+        self.turn_idx = p_idx
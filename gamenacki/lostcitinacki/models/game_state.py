@@ -1,12 +1,23 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import random
 
 from gamenacki.common.base_game_state import BaseGameState
 from gamenacki.common.dealer import Dealer
+from gamenacki.common.profiler import Profiler
 from gamenacki.common.piles import Hand, Discard
 from gamenacki.common.scorer import Ledger, WinCondition, Scorer
 from gamenacki.lostcitinacki.models.cards import Card
+from gamenacki.lostcitinacki.models.compact import encode
 from gamenacki.lostcitinacki.models.constants import Color, PlayToStack, DrawFromStack
-from gamenacki.lostcitinacki.models.piles import ExpeditionBoard, Deck, Piles
+from gamenacki.lostcitinacki.models.piles import ExpeditionBoard, Deck, Piles, FULL_DECK
+from gamenacki.lostcitinacki.models.snapshot import GameStateSnapshot
+from gamenacki.lostcitinacki.models.zobrist import (BOARD_KEYS, DECK_SIZE_KEYS, DISCARD_KEYS, HAND_KEYS, MASK_64,
+                                                    TURN_KEYS, key_of)
+
+Move = tuple[Card, PlayToStack, DrawFromStack]
+# what GameState.apply returns & GameState.undo takes:
+# (p_idx, hand position, card, move, previous color max, previous zobrist key or None)
+UndoToken = tuple[int, int, Card, Move, int, int | None]
 
 
 @dataclass
@@ -18,16 +29,52 @@ class GameState(BaseGameState):
         dealer: Dealer
     """
     max_rounds: int
+    color_maxes: dict[Color, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _maxed_color_cnt: int = field(init=False, repr=False, compare=False)
+    _board_playable_cards: list[Card] | None = field(init=False, repr=False, compare=False)
+    _last_snapshot: GameStateSnapshot | None = field(default=None, init=False, repr=False, compare=False)
+    # counts calls to the properties & methods that walk piles, when set
+    profiler: Profiler | None = field(default=None, init=False, repr=False, compare=False)
+    # the position key, once zobrist_key has been read; None until then, so games that never read it don't keep it
+    _zobrist: int | None = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
-        self.create_piles()
-        self.deal()
+        """Piles that arrive with hands already in them (ex: from a snapshot) are kept as they are"""
+        if not self.piles.hands:
+            self.create_piles()
+            self.deal()
+        self.reset_color_maxes()
 
     @classmethod
-    def create_game_state(cls, player_cnt: int, max_rounds: int):
-        return cls(player_cnt=player_cnt, piles=Piles(),
+    def create_game_state(cls, player_cnt: int, max_rounds: int, rng: random.Random | None = None):
+        """Every shuffle & random choice of the game draws from rng, or from the global random module without it"""
+        return cls(player_cnt=player_cnt, piles=Piles(deck=Deck(rng=rng)),
                    scorer=Scorer([Ledger() for _ in range(player_cnt)], WinCondition.HIGHEST_SCORE_W_TIES),
-                   dealer=Dealer(player_cnt), max_rounds=max_rounds)
+                   dealer=Dealer(player_cnt, rng=rng), max_rounds=max_rounds)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: GameStateSnapshot, max_rounds: int, rng: random.Random | None = None):
+        player_cnt = len(snapshot.hands)
+        dealer = Dealer(player_cnt, snapshot.dealer_idx, snapshot.turn_idx, rng=rng)
+        dealer.current_round_number = snapshot.round_number
+        return cls(player_cnt=player_cnt, piles=snapshot.to_piles(),
+                   scorer=Scorer([Ledger(list(pl)) for pl in snapshot.ledgers], WinCondition.HIGHEST_SCORE_W_TIES),
+                   dealer=dealer, max_rounds=max_rounds)
+
+    def snapshot(self) -> GameStateSnapshot:
+        """Shares unchanged piles with the previous snapshot, so logging every turn stays cheap"""
+        if self.profiler:
+            self.profiler.count('snapshot')
+        self._last_snapshot = GameStateSnapshot.from_game_state(self, self._last_snapshot)
+        return self._last_snapshot
+
+    @property
+    def zobrist_key(self) -> int:
+        """A 64-bit key of the position (see models/zobrist.py). The first read computes it; from then on it is kept
+        current as cards move rather than recomputed"""
+        if self._zobrist is None:
+            self._zobrist = key_of(self)
+        return self._zobrist
 
     @property
     def has_game_started(self) -> bool:
@@ -43,7 +90,9 @@ class GameState(BaseGameState):
 
     @property
     def is_round_over(self) -> bool:
-        return len(self.piles.deck.cards) == 0 or set(self.color_maxes.values()) == {10}
+        if self.profiler:
+            self.profiler.count('is_round_over')
+        return len(self.piles.deck.cards) == 0 or self._maxed_color_cnt == len(self.color_maxes)
 
     @property
     def winner(self) -> None | tuple[int, int] | list[tuple[int, int]]:
@@ -52,18 +101,42 @@ class GameState(BaseGameState):
             return None
         return self.scorer.get_winner(self.is_game_over)
 
-    @property
-    def color_maxes(self) -> dict[Color: int]:
-        return {c: max([p.get_max_card_in_color(c) for p in self.piles.exp_boards]) for c in list(Color)}
-
     @property
     def board_playable_cards(self) -> list[Card]:
-        fresh_deck = Deck()
-        return [c for c in fresh_deck if c.value > self.color_maxes[c.color] or self.color_maxes[c.color] == 0]
+        """Rebuilt only after a color max changes; callers must not mutate the returned list"""
+        if self.profiler:
+            self.profiler.count('board_playable_cards')
+        if self._board_playable_cards is None:
+            if self.profiler:
+                self.profiler.count('board_playable_cards rebuilt')
+            self._board_playable_cards = [c for c in FULL_DECK if self.is_card_playable(c)]
+        return self._board_playable_cards
 
     @property
     def is_discard_card_playable(self) -> bool:
-        return self.piles.discard.peek() in self.board_playable_cards
+        top_card = self.piles.discard.peek()
+        return top_card is not None and self.is_card_playable(top_card)
+
+    def is_card_playable(self, c: Card) -> bool:
+        color_max = self.color_maxes[c.color]
+        return color_max == 0 or c.value > color_max
+
+    def reset_color_maxes(self) -> None:
+        """color_maxes is the highest numbered card played to any board, per color; kept current by _play_to_exp_pile"""
+        if self.profiler:
+            self.profiler.count('reset_color_maxes')
+        for c in Color:
+            self.color_maxes[c] = max([p.get_max_card_in_color(c) for p in self.piles.exp_boards], default=0)
+        self._maxed_color_cnt = sum(1 for v in self.color_maxes.values() if v == 10)
+        self._board_playable_cards = None
+
+    def clear_caches(self) -> None:
+        """Drops what is derived from the piles (board_playable_cards, the snapshot the next one shares piles with &
+        zobrist_key) so each is rebuilt on next use; for callers that change piles other than through play_card_to,
+        draw_from & apply. color_maxes is rebuilt by reset_color_maxes instead"""
+        self._board_playable_cards = None
+        self._last_snapshot = None
+        self._zobrist = None
 
     def create_piles(self) -> None:
         for _ in range(self.player_cnt):
@@ -71,17 +144,31 @@ class GameState(BaseGameState):
             self.piles.exp_boards.append(ExpeditionBoard())
 
     def create_new_round(self):
+        """Reuses every card, hand, board, deck & discard in place; only short-lived temporaries are allocated (by
+        reset_color_maxes, Dealer.deal & key_of)"""
         [h.clear() for h in self.piles.hands]
         [e.clear() for e in self.piles.exp_boards]
-        self.piles.deck = Deck()
-        self.piles.discard = Discard()
+        self.piles.deck.reset(self.dealer.rng)
+        self.piles.discard.clear()
+        self._last_snapshot = None
         self.dealer.advance_button()
         self.dealer.set_player_idx_as_left_of_dealer()
+        self.reset_color_maxes()
         self.deal()
         self.dealer.increment_round_number()
 
+    def create_new_game(self):
+        """Starts round 1 of a new game in this GameState, reusing its hands, boards & ledgers"""
+        [pl.ledger.clear() for pl in self.scorer.ledgers]
+        self.dealer.current_round_number = 0
+        # create_new_round advances the button onto the randomly selected dealer
+        self.dealer.dealer_idx = (self.dealer.select_random_p_idx() - 1) % self.player_cnt
+        self.create_new_round()
+
     def deal(self, card_cnt: int = 8):
         self.dealer.deal(self.piles.deck, [_ for _ in self.piles.hands], card_cnt)
+        if self._zobrist is not None:
+            self._zobrist = key_of(self)
 
     def play_card_to(self, p_idx: int, c: Card, dest_pile: PlayToStack) -> Color | Discard:
         hand = self.piles.hands[p_idx]
@@ -89,9 +176,12 @@ class GameState(BaseGameState):
         if c not in hand.cards:
             raise ValueError(f"{c} is not in the hand")
         if dest_pile == PlayToStack.DISCARD:
-            return self._play_to_discard(hand, c)
+            dest = self._play_to_discard(hand, c)
         else:
-            return self._play_to_exp_pile(hand, c, exp_board)
+            dest = self._play_to_exp_pile(hand, c, exp_board)
+        if self._zobrist is not None:
+            self._rekey_play(p_idx, c, dest_pile)
+        return dest
 
     def draw_from(self, p_idx: int, source_pile: DrawFromStack):
         hand = self.piles.hands[p_idx]
@@ -100,6 +190,92 @@ class GameState(BaseGameState):
             raise ValueError("There are no cards here")
         hand.push(returned_card)
         self.dealer.player_turn_idx = self.dealer.next_player_idx()
+        if self._zobrist is not None:
+            self._rekey_draw(p_idx, returned_card, source_pile)
+
+    def _rekey_play(self, p_idx: int, c: Card, dest_pile: PlayToStack) -> None:
+        """Moves c's key from p_idx's hand to dest_pile, after c was played there"""
+        code = encode(c)
+        dest_keys = DISCARD_KEYS[len(self.piles.discard) - 1] if dest_pile == PlayToStack.DISCARD else BOARD_KEYS[p_idx]
+        self._zobrist = (self._zobrist - HAND_KEYS[p_idx][code] + dest_keys[code]) & MASK_64
+
+    def _rekey_draw(self, p_idx: int, c: Card, source_pile: DrawFromStack) -> None:
+        """Moves c's key from source_pile to p_idx's hand & the turn's key on, after c was drawn & the turn passed"""
+        code = encode(c)
+        if source_pile == DrawFromStack.DECK:
+            deck_size = len(self.piles.deck)
+            source_key = DECK_SIZE_KEYS[deck_size + 1] - DECK_SIZE_KEYS[deck_size]
+        else:
+            source_key = DISCARD_KEYS[len(self.piles.discard)][code]
+        self._zobrist = (self._zobrist - source_key + HAND_KEYS[p_idx][code]
+                         - TURN_KEYS[p_idx] + TURN_KEYS[self.dealer.player_turn_idx]) & MASK_64
+
+    def legal_moves(self) -> list[Move]:
+        """Every distinct (card, play to, draw from) the current player may make; equal cards (ex: handshakes of
+        one color) appear once. A card may go to an expedition if it is in board_playable_cards, and the discard may
+        only be drawn from when the card was not just discarded"""
+        if self.profiler:
+            self.profiler.count('legal_moves')
+        if self.is_round_over:
+            return []
+        hand = self.piles.hands[self.dealer.player_turn_idx].cards
+        can_draw_discard = len(self.piles.discard) > 0
+        moves, seen = [], []
+        for c in hand:
+            if c in seen:
+                continue
+            seen.append(c)
+            if self.is_card_playable(c):
+                moves.append((c, PlayToStack.EXPEDITION, DrawFromStack.DECK))
+                if can_draw_discard:
+                    moves.append((c, PlayToStack.EXPEDITION, DrawFromStack.DISCARD))
+            moves.append((c, PlayToStack.DISCARD, DrawFromStack.DECK))
+        return moves
+
+    def apply(self, move: Move) -> UndoToken:
+        """Plays & draws for the current player in place, trusting that move came from legal_moves.
+        Returns a token that undo uses to reverse the move exactly"""
+        c, play_to, draw_from = move
+        p_idx = self.dealer.player_turn_idx
+        prev_key = self._zobrist
+        hand = self.piles.hands[p_idx]._items
+        hand_pos = hand.index(c)
+        played = hand.pop(hand_pos)
+        prev_max = self.color_maxes[played.color]
+        if play_to == PlayToStack.DISCARD:
+            self.piles.discard.push(played)
+        else:
+            next(pile for pile in self.piles.exp_boards[p_idx].expeditions if pile.color == played.color).push(played)
+            if played.value > prev_max:
+                self.color_maxes[played.color] = played.value
+                self._maxed_color_cnt += played.value == 10
+                self._board_playable_cards = None
+        if prev_key is not None:
+            self._rekey_play(p_idx, played, play_to)
+        drawn = self.piles.deck.pop() if draw_from == DrawFromStack.DECK else self.piles.discard.pop()
+        hand.append(drawn)
+        self.dealer.player_turn_idx = self.dealer.next_player_idx()
+        if prev_key is not None:
+            self._rekey_draw(p_idx, drawn, draw_from)
+        return p_idx, hand_pos, played, move, prev_max, prev_key
+
+    def undo(self, token: UndoToken) -> None:
+        p_idx, hand_pos, played, (_, play_to, draw_from), prev_max, prev_key = token
+        hand = self.piles.hands[p_idx]._items
+        drawn = hand.pop()
+        (self.piles.deck if draw_from == DrawFromStack.DECK else self.piles.discard).push(drawn)
+        if play_to == PlayToStack.DISCARD:
+            self.piles.discard.pop()
+        else:
+            next(pile for pile in self.piles.exp_boards[p_idx].expeditions if pile.color == played.color).pop()
+            if self.color_maxes[played.color] != prev_max:
+                self._maxed_color_cnt -= self.color_maxes[played.color] == 10
+                self.color_maxes[played.color] = prev_max
+                self._board_playable_cards = None
+        hand.insert(hand_pos, played)
+        self.dealer.player_turn_idx = p_idx
+        self._zobrist = prev_key
+        self._last_snapshot = None
 
     def _play_to_discard(self, h: Hand, c: Card) -> Discard:
         h.remove(c)
@@ -108,11 +284,15 @@ class GameState(BaseGameState):
 
     def _play_to_exp_pile(self, h: Hand, c: Card, exp_board: ExpeditionBoard) -> Color:
         dest_pile = next(pile for pile in exp_board.expeditions if pile.color == c.color)
-        max_number_in_color = max([p.get_max_card_in_color(c.color) for p in self.piles.exp_boards])
+        max_number_in_color = self.color_maxes[c.color]
         if max_number_in_color > c.value > 0:
             raise ValueError(f"You must play higher than a {max_number_in_color}")
         h.remove(c)
         dest_pile.push(c)
+        if c.value > max_number_in_color:
+            self.color_maxes[c.color] = c.value
+            self._maxed_color_cnt += c.value == 10
+            self._board_playable_cards = None
         return dest_pile.color
 
     def assign_points(self) -> None:
@@ -3,37 +3,72 @@
 from dataclasses import dataclass, field
 
 from gamenacki.common.piles import CardStack, BaseDeck, Hand, Discard
-from gamenacki.lostcitinacki.models.cards import Card, Handshake, ExpeditionCard
+from gamenacki.lostcitinacki.models.cards import DECK_CARDS, Card, ExpeditionCard
 from gamenacki.lostcitinacki.models.constants import Color
 
 
 @dataclass
 class Expedition(CardStack):
+    """Keeps a running value sum & handshake count, so points never walk the pile"""
     color: Color = None
+    _value_sum: int = field(default=0, init=False, repr=False, compare=False)
+    _handshake_cnt: int = field(default=0, init=False, repr=False, compare=False)
 
     def __post_init__(self):
+        super().__post_init__()
         if not self.color:
             raise ValueError("Color must be provided")
+        self._recount()
 
     def __repr__(self) -> str:
         return f'{self.color.value} {self.cards}'
 
+    @CardStack.cards.setter
+    def cards(self, value: list):
+        CardStack.cards.fset(self, value)
+        self._recount()
+
+    def _recount(self) -> None:
+        self._value_sum = sum([c.value for c in self._items])
+        self._handshake_cnt = sum([1 for c in self._items if not c.value])
+
+    def push(self, item: Card):
+        self._items.append(item)
+        self._value_sum += item.value
+        self._handshake_cnt += not item.value
+
+    def pop(self) -> Card | None:
+        if not self._items:
+            return None
+        item = self._items.pop()
+        self._value_sum -= item.value
+        self._handshake_cnt -= not item.value
+        return item
+
+    def remove(self, item: Card):
+        super().remove(item)
+        self._value_sum -= item.value
+        self._handshake_cnt -= not item.value
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._value_sum = self._handshake_cnt = 0
+
     @property
     def card_cnt(self) -> int:
-        return len(self)
+        return len(self._items)
 
     @property
     def handshake_cnt(self) -> int:
-        return sum([1 for c in self if isinstance(c, Handshake)])
+        return self._handshake_cnt
 
     @property
     def points(self) -> int:
-        if not self.card_cnt:
+        card_cnt = len(self._items)
+        if not card_cnt:
             return 0
-        plus_minus = sum([c.value for c in self]) - 20
-        multiplier = 1 + self.handshake_cnt
-        bonus = 20 if self.card_cnt >= 8 else 0
-        return plus_minus * multiplier + bonus
+        bonus = 20 if card_cnt >= 8 else 0
+        return (self._value_sum - 20) * (1 + self._handshake_cnt) + bonus
 
 
 def create_board() -> list[Expedition]:
@@ -66,10 +101,12 @@ class ExpeditionBoard:
 @dataclass
 class Deck(BaseDeck):
     @staticmethod
-    def build_deck() -> list[Card]:
-        handshakes: list[Handshake] = [Handshake(c) for c in list(Color) for _ in range(3)]
-        expeditions: list[ExpeditionCard] = [ExpeditionCard(c, v) for c in list(Color) for v in range(6, 11)]
-        return handshakes + expeditions
+    def build_deck() -> tuple[Card, ...]:
+        """Handshakes, then expedition cards, each by color; the shared flyweights of cards.DECK_CARDS"""
+        return DECK_CARDS
+
+
+FULL_DECK: tuple[Card, ...] = DECK_CARDS
 
 
 @dataclass
@@ -0,0 +1,72 @@
+"""Immutable, compact point-in-time copies of a GameState, cheap enough to take every turn.
+
+Piles are stored as bytes of compact card codes (see models.compact), so a snapshot is a few hundred bytes
+and shares nothing mutable with the live GameState. GameState.from_snapshot rebuilds a playable GameState.
+"""
+
+from dataclasses import dataclass
+
+from gamenacki.common.piles import Hand, Discard
+from gamenacki.lostcitinacki.models.compact import COLOR_BASE, VALUE_SLOT, decode, decode_pile, color_idx_of
+from gamenacki.lostcitinacki.models.piles import Deck, ExpeditionBoard, Piles
+
+
+@dataclass(frozen=True, slots=True)
+class GameStateSnapshot:
+    """boards holds each player's expeditions concatenated in Color order, each in the order played"""
+    round_number: int
+    dealer_idx: int
+    turn_idx: int
+    hands: tuple[bytes, ...]
+    boards: tuple[bytes, ...]
+    deck: bytes
+    discard: bytes
+    ledgers: tuple[tuple[int, ...], ...]
+
+    @classmethod
+    def from_game_state(cls, gs, previous: "GameStateSnapshot | None" = None) -> "GameStateSnapshot":
+        """Within a round the deck only shrinks & boards & ledgers only grow, so when previous is from the same round
+        those parts are shared with it instead of re-encoded"""
+        base, slot = COLOR_BASE, VALUE_SLOT
+        piles, round_number = gs.piles, gs.dealer.current_round_number
+        same_round = previous is not None and previous.round_number == round_number
+
+        deck = piles.deck._items
+        deck_codes = previous.deck[:len(deck)] if same_round else bytes([base[c.color] + slot[c.value] for c in deck])
+        boards = []
+        for i, board in enumerate(piles.exp_boards):
+            board_cnt = sum([len(exp._items) for exp in board.expeditions])
+            if same_round and len(previous.boards[i]) == board_cnt:
+                boards.append(previous.boards[i])
+            else:
+                boards.append(bytes([base[c.color] + slot[c.value] for exp in board.expeditions for c in exp._items]))
+        ledgers = tuple(tuple(pl.ledger) for pl in gs.scorer.ledgers)
+        if previous is not None and ledgers == previous.ledgers:
+            ledgers = previous.ledgers
+
+        return cls(round_number=round_number,
+                   dealer_idx=gs.dealer.dealer_idx,
+                   turn_idx=gs.dealer.player_turn_idx,
+                   hands=tuple(bytes([base[c.color] + slot[c.value] for c in h._items]) for h in piles.hands),
+                   boards=tuple(boards),
+                   deck=deck_codes,
+                   discard=bytes([base[c.color] + slot[c.value] for c in piles.discard._items]),
+                   ledgers=ledgers)
+
+    def __repr__(self) -> str:
+        return (f"Round: {self.round_number}, Dealer: {self.dealer_idx}, Turn: {self.turn_idx}, "
+                f"Hands: {[decode_pile(h) for h in self.hands]}, Boards: {[decode_pile(b) for b in self.boards]}, "
+                f"Discard: {decode_pile(self.discard)}, Deck: {len(self.deck)} cards, Ledgers: {list(self.ledgers)}")
+
+    def to_piles(self) -> Piles:
+        deck = Deck(start_shuffled=False)
+        deck.cards = decode_pile(self.deck)
+        deck.start_shuffled = True  # as any game's deck, so later rounds are dealt from a shuffled one
+        piles = Piles(hands=[Hand(decode_pile(h)) for h in self.hands], deck=deck,
+                      discard=Discard(decode_pile(self.discard)))
+        for board_codes in self.boards:
+            board = ExpeditionBoard()
+            for code in board_codes:
+                board.expeditions[color_idx_of(code)].push(decode(code))
+            piles.exp_boards.append(board)
+        return piles
@@ -0,0 +1,47 @@
+"""Zobrist-style 64-bit position keys for GameState: hands, expeditions, the discard (in order), the deck's size &
+whose turn it is. Round number, dealer, scores & the deck's order are left out.
+
+A key is the sum, mod 2**64, of one fixed random number per fact (ex: 'the R7 is in player 1's hand', 'the 3rd card
+of the discard is a BH'). Summing rather than XORing keeps equal cards (a color's handshakes) from cancelling out, &
+still lets GameState move a card's number from one pile to another instead of rehashing every pile.
+
+Example usage:
+    gs.zobrist_key == key_of(gs)  # once read, GameState keeps its key current as cards move; key_of recomputes it
+"""
+
+import random
+
+from gamenacki.lostcitinacki.models.compact import CARD_CNT, encode
+from gamenacki.lostcitinacki.models.piles import FULL_DECK
+
+MAX_PLAYERS = 8
+MASK_64 = (1 << 64) - 1
+
+# fixed, so keys agree across processes & runs
+_rng = random.Random('lostcitinacki zobrist')
+
+
+def _numbers(n: int) -> tuple[int, ...]:
+    return tuple(_rng.getrandbits(64) for _ in range(n))
+
+
+# HAND_KEYS[p_idx][code], BOARD_KEYS[p_idx][code], DISCARD_KEYS[position][code], DECK_SIZE_KEYS[size], TURN_KEYS[p_idx]
+HAND_KEYS: tuple[tuple[int, ...], ...] = tuple(_numbers(CARD_CNT) for _ in range(MAX_PLAYERS))
+BOARD_KEYS: tuple[tuple[int, ...], ...] = tuple(_numbers(CARD_CNT) for _ in range(MAX_PLAYERS))
+DISCARD_KEYS: tuple[tuple[int, ...], ...] = tuple(_numbers(CARD_CNT) for _ in range(len(FULL_DECK)))
+DECK_SIZE_KEYS: tuple[int, ...] = _numbers(len(FULL_DECK) + 1)
+TURN_KEYS: tuple[int, ...] = _numbers(MAX_PLAYERS)
+
+
+def key_of(gs) -> int:
+    """gs's key computed from scratch"""
+    if gs.player_cnt > MAX_PLAYERS:
+        raise ValueError(f"Position keys cover at most {MAX_PLAYERS} players")
+    piles = gs.piles
+    key = DECK_SIZE_KEYS[len(piles.deck)] + TURN_KEYS[gs.dealer.player_turn_idx]
+    for p_idx, hand in enumerate(piles.hands):
+        key += sum(HAND_KEYS[p_idx][encode(c)] for c in hand)
+    for p_idx, board in enumerate(piles.exp_boards):
+        key += sum(BOARD_KEYS[p_idx][encode(c)] for exp in board for c in exp)
+    key += sum(DISCARD_KEYS[i][encode(c)] for i, c in enumerate(piles.discard))
+    return key & MASK_64
@@ -1,18 +1,29 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import random
 import time
+from typing import TYPE_CHECKING
 
 from gamenacki.lostcitinacki.models.cards import Card
 from gamenacki.lostcitinacki.models.constants import DrawFromStack, PlayToStack
 from gamenacki.common.piles import Hand
 
+if TYPE_CHECKING:
+    from gamenacki.lostcitinacki.models.game_state import GameState
+
 
 @dataclass
 class Player(ABC):
     idx: int
     name: str
 
+    def observe(self, gs: "GameState") -> None:
+        """Called by the engine before play_card with the live GameState; players that search override it"""
+
+    def use_rng(self, rng: random.Random) -> None:
+        """Offered a stream of the game's seed by a seeded engine; players that draw random numbers & have no
+        stream of their own take it"""
+
     @abstractmethod
     def play_card(self, h: Hand, board_playable_cards: list[Card]) -> tuple[Card, PlayToStack]:
         ...
@@ -49,15 +60,31 @@ class ConsolePlayer(Player):
 
 @dataclass
 class BotPlayer(Player):
+    think_time: float = 0.5
+    rng: random.Random | None = field(default=None, repr=False, compare=False)
+    _own_rng: bool = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._own_rng = self.rng is not None
+
+    def use_rng(self, rng: random.Random) -> None:
+        """A stream passed in as rng is kept; otherwise each seeded game's stream replaces the last game's"""
+        if not self._own_rng:
+            self.rng = rng
+
     def play_card(self, h: Hand, board_playable_cards: list[Card]) -> tuple[Card, PlayToStack]:
-        time.sleep(0.5)
-        playable_cards = [card for card in h.cards if card in board_playable_cards]
+        if self.think_time:
+            time.sleep(self.think_time)
+        rng = self.rng or random
+        playable = set(board_playable_cards)
+        playable_cards = [card for card in h.cards if card in playable]
         if not playable_cards:
-            return random.choice(h.cards), PlayToStack.DISCARD
-        return random.choice(playable_cards), PlayToStack.EXPEDITION
+            return rng.choice(h.cards), PlayToStack.DISCARD
+        return rng.choice(playable_cards), PlayToStack.EXPEDITION
 
     def _child_pick_up_from(self, is_discard_card_playable: bool) -> DrawFromStack:
-        time.sleep(0.5)
+        if self.think_time:
+            time.sleep(self.think_time)
         if not is_discard_card_playable:
             return DrawFromStack.DECK
-        return DrawFromStack.DECK if random.randint(1, 10) > 8 else DrawFromStack.DISCARD
+        return DrawFromStack.DECK if (self.rng or random).randint(1, 10) > 8 else DrawFromStack.DISCARD
@@ -0,0 +1,191 @@
+"""A compact, append-only binary format for recorded games, written as the game is played & read back lazily.
+
+A file starts with MAGIC, followed by any number of games. Each game is a stream of records:
+    GAME_START  tag, has_seed, seed (u64), player_cnt, max_rounds
+    ROUND_START tag, round_number, dealer_idx, turn_idx, deck (len + card codes, top last), each hand (len + codes)
+    turn        1 byte: card code (bits 0-5), played to discard (bit 6), drew from discard (bit 7)
+    ROUND_END   tag, each player's points for the round (i16)
+    GAME_END    tag
+Card codes are those of models.compact & are always < 40, so a turn byte can never be mistaken for a tag.
+
+Example usage:
+    with open('games.lcr', 'ab') as f:
+        simulate(game_cnt=1000, seed=7, listeners=[GameRecordWriter(f)])
+    for record in read_game_records('games.lcr'):
+        ...
+"""
+
+from dataclasses import dataclass
+import mmap
+import struct
+from typing import BinaryIO, Iterable, Iterator
+
+from gamenacki.common.log import Event, LogLevel
+from gamenacki.lostcitinacki.models.cards import Card
+from gamenacki.lostcitinacki.models.compact import CARD_CNT, encode, decode
+from gamenacki.lostcitinacki.models.constants import Action, DrawFromStack, PlayToStack
+from gamenacki.lostcitinacki.models.game_state import GameState
+from gamenacki.lostcitinacki.models.snapshot import GameStateSnapshot
+
+MAGIC = b'LCR\x01'
+GAME_START = 0x3F
+ROUND_START = 0x3E
+ROUND_END = 0x3D
+GAME_END = 0x3C
+_GAME_START = struct.Struct('<BBQBB')
+TO_DISCARD_BIT = 0x40
+FROM_DISCARD_BIT = 0x80
+CODE_BITS = 0x3F
+
+
+@dataclass(frozen=True, slots=True)
+class GameStartRecord:
+    seed: int | None
+    player_cnt: int
+    max_rounds: int
+
+
+@dataclass(frozen=True, slots=True)
+class RoundStartRecord:
+    round_number: int
+    dealer_idx: int
+    turn_idx: int
+    deck: bytes
+    hands: tuple[bytes, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class TurnRecord:
+    player_idx: int
+    code: int
+    play_to: PlayToStack
+    draw_from: DrawFromStack
+
+    @property
+    def card(self) -> Card:
+        return decode(self.code)
+
+
+@dataclass(frozen=True, slots=True)
+class RoundEndRecord:
+    points: tuple[int, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class GameEndRecord:
+    ...
+
+
+Record = GameStartRecord | RoundStartRecord | TurnRecord | RoundEndRecord | GameEndRecord
+
+
+def turn_byte(c: Card, play_to: PlayToStack, draw_from: DrawFromStack) -> int:
+    return (encode(c) | (TO_DISCARD_BIT if play_to == PlayToStack.DISCARD else 0)
+            | (FROM_DISCARD_BIT if draw_from == DrawFromStack.DISCARD else 0))
+
+
+class GameRecordWriter:
+    """A Log listener that appends each game to a binary stream as it is played; it needs every play & draw logged"""
+    min_level = LogLevel.ACTIONS
+
+    def __init__(self, stream: BinaryIO, write_magic: bool = True):
+        self.stream = stream
+        self._player_cnt = 0
+        self._pending_play: tuple[Card, PlayToStack] | None = None
+        if write_magic and stream.tell() == 0:
+            stream.write(MAGIC)
+
+    def __call__(self, event: Event) -> None:
+        gs = event.game_state
+        if event.action == Action.BEGIN_GAME:
+            seed = event.attributes.get('seed')
+            self._player_cnt = len(gs.hands)
+            self.stream.write(_GAME_START.pack(GAME_START, seed is not None, seed or 0, self._player_cnt,
+                                               event.attributes.get('max_rounds', 0)))
+        elif event.action == Action.BEGIN_ROUND:
+            self.stream.write(bytes((ROUND_START, gs.round_number, gs.dealer_idx, gs.turn_idx, len(gs.deck)))
+                              + gs.deck + b''.join(bytes((len(h),)) + h for h in gs.hands))
+        elif event.action == Action.PLAY_CARD:
+            self._pending_play = event.attributes['card'], event.attributes['play_to']
+        elif event.action == Action.PICKUP_CARD:
+            if self._pending_play is None:
+                raise ValueError("a draw was logged without the play before it")
+            c, play_to = self._pending_play
+            self._pending_play = None
+            self.stream.write(bytes((turn_byte(c, play_to, event.attributes['draw_from']),)))
+        elif event.action == Action.END_ROUND:
+            self.stream.write(struct.pack(f'<B{self._player_cnt}h', ROUND_END, *(pl[-1] for pl in gs.ledgers)))
+        elif event.action == Action.END_GAME:
+            self.stream.write(bytes((GAME_END,)))
+            self.stream.flush()
+
+
+def iter_records(buf: bytes | memoryview, offset: int = 0) -> Iterator[Record]:
+    """Decodes records lazily from a buffer of one or more games (with no MAGIC) starting at offset"""
+    player_cnt, turn_idx, end = 0, 0, len(buf)
+    while offset < end:
+        tag = buf[offset]
+        if (tag & CODE_BITS) < CARD_CNT:
+            yield TurnRecord(turn_idx, tag & CODE_BITS,
+                             PlayToStack.DISCARD if tag & TO_DISCARD_BIT else PlayToStack.EXPEDITION,
+                             DrawFromStack.DISCARD if tag & FROM_DISCARD_BIT else DrawFromStack.DECK)
+            turn_idx = (turn_idx + 1) % player_cnt
+            offset += 1
+        elif tag == ROUND_START:
+            round_number, dealer_idx, turn_idx, deck_len = buf[offset + 1:offset + 5]
+            offset += 5
+            deck = bytes(buf[offset:offset + deck_len])
+            offset += deck_len
+            hands = []
+            for _ in range(player_cnt):
+                hand_len = buf[offset]
+                hands.append(bytes(buf[offset + 1:offset + 1 + hand_len]))
+                offset += 1 + hand_len
+            yield RoundStartRecord(round_number, dealer_idx, turn_idx, deck, tuple(hands))
+        elif tag == ROUND_END:
+            points = struct.unpack_from(f'<{player_cnt}h', buf, offset + 1)
+            offset += 1 + 2 * player_cnt
+            yield RoundEndRecord(points)
+        elif tag == GAME_START:
+            _, has_seed, seed, player_cnt, max_rounds = _GAME_START.unpack_from(buf, offset)
+            offset += _GAME_START.size
+            yield GameStartRecord(seed if has_seed else None, player_cnt, max_rounds)
+        elif tag == GAME_END:
+            offset += 1
+            yield GameEndRecord()
+        else:
+            raise ValueError(f"Unknown record tag {tag:#x} at offset {offset}")
+
+
+def read_game_records(path: str) -> Iterator[Record]:
+    """Memory-maps a record file & yields its records lazily"""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a game record file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as buf:
+                yield from iter_records(buf, len(MAGIC))
+
+
+def replay(records: Iterable[Record], turn: int | None = None) -> GameState:
+    """Rebuilds the GameState of one game after its first `turn` turns (counted across rounds), or at its end"""
+    gs, max_rounds, ledgers, turns_played = None, 0, (), 0
+    for record in records:
+        if isinstance(record, GameStartRecord):
+            max_rounds, ledgers = record.max_rounds, tuple(() for _ in range(record.player_cnt))
+        elif isinstance(record, RoundStartRecord):
+            gs = GameState.from_snapshot(GameStateSnapshot(record.round_number, record.dealer_idx, record.turn_idx,
+                                                           record.hands, tuple(b'' for _ in record.hands),
+                                                           record.deck, b'', ledgers), max_rounds)
+        elif isinstance(record, TurnRecord):
+            if turn is not None and turns_played == turn:
+                break
+            gs.play_card_to(record.player_idx, record.card, record.play_to)
+            gs.draw_from(record.player_idx, record.draw_from)
+            turns_played += 1
+        elif isinstance(record, RoundEndRecord):
+            gs.assign_points()
+            ledgers = tuple(tuple(pl.ledger) for pl in gs.scorer.ledgers)
+        elif isinstance(record, GameEndRecord):
+            break
+    return gs
@@ -2,6 +2,9 @@ import time
 
 from gamenacki.common.log import Log
 from gamenacki.common.base_renderer import Renderer
+from gamenacki.lostcitinacki.models.changes import (CardDrawn, CardPlayed, Change, DeckCountChanged, DiscardTopChanged,
+                                                     GameEnded, RoundEnded, RoundStarted, TurnChanged)
+from gamenacki.lostcitinacki.models.constants import PlayToStack
 from gamenacki.lostcitinacki.players import Player
 from gamenacki.lostcitinacki.models.game_state import GameState
 
@@ -46,3 +49,38 @@ class ConsoleRenderer(Renderer):
     def render_log(self, game_log: Log) -> None:
         for event in game_log:
             print(event)
+
+
+class ConsoleDeltaRenderer(ConsoleRenderer):
+    """Prints a line per change instead of redrawing every pile each turn; seat 0 is the console player's"""
+    wants_changes = True
+
+    def apply_changes(self, gs: GameState, players: list[Player], changes: list[Change]) -> None:
+        for change in changes:
+            if isinstance(change, CardPlayed):
+                dest = 'the discard' if change.play_to == PlayToStack.DISCARD else f'the {change.card.color} expedition'
+                print(f'{players[change.player_idx].name} played {change.card} to {dest}')
+            elif isinstance(change, CardDrawn):
+                drawn = change.card if change.player_idx == 0 else 'a card'
+                print(f'{players[change.player_idx].name} drew {drawn} from the {change.draw_from}')
+            elif isinstance(change, DiscardTopChanged):
+                print('Discard:', change.top or '[]')
+            elif isinstance(change, DeckCountChanged):
+                print('Deck:', change.count)
+            elif isinstance(change, TurnChanged) and change.player_idx == 0:
+                print('Your Hand:', gs.piles.hands[0].cards)
+                print()
+            elif isinstance(change, (RoundStarted, RoundEnded, GameEnded)):
+                self.render(gs, players)
+
+
+class NullRenderer(Renderer):
+    """Renders nothing; used for headless simulations"""
+    def render(self, gs: GameState, players: list[Player]) -> None:
+        pass
+
+    def render_error(self, exc: Exception) -> None:
+        pass
+
+    def render_log(self, game_log: Log) -> None:
+        pass
@@ -0,0 +1,84 @@
+"""A persistent process pool that runs root-parallel ISMCTS for search players, getting past the GIL.
+
+Each request ships the compact InformationSet to every worker; each worker searches its own tree with its own seed,
+and the root statistics are summed. Workers are started once, on the pool's first search, not per move. A pickled pool
+arrives without workers & searches in the process holding it, so an ISMCTSPlayer holding one can be a tournament
+Entrant, whose worker processes already play in parallel; starting workers of its own there would nest pools.
+
+Example usage:
+    with RolloutPool(workers=8) as pool:
+        players = [ISMCTSPlayer(0, 'Wide', rollouts=20000, time_limit_ms=500, pool=pool), BotPlayer(1, 'Bot')]
+        LostCities(players, ConsoleRenderer()).play()
+"""
+
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import math
+import os
+import random
+
+from gamenacki.lostcitinacki.ismcts import InformationSet, search
+from gamenacki.lostcitinacki.models.compact import CompactMove
+
+# how long past its time limit a request waits for slow workers before merging without them
+GRACE_MS = 50
+
+
+def _search_worker(info_set: InformationSet, rollouts: int, time_limit_ms: float | None, exploration: float,
+                   seed: int) -> dict[CompactMove, tuple[int, float]]:
+    return search(info_set, rollouts, time_limit_ms, exploration, random.Random(seed))
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+class RolloutPool:
+    def __init__(self, workers: int | None = None, seed: int | None = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor: ProcessPoolExecutor | None = None
+        self._seeder = random.Random(seed)
+        self._in_process = False
+
+    def __getstate__(self) -> dict:
+        return {**self.__dict__, '_executor': None, '_in_process': True}
+
+    def __enter__(self) -> "RolloutPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def search(self, info_set: InformationSet, rollouts: int, time_limit_ms: float | None = None,
+               exploration: float = 0.7) -> dict[CompactMove, tuple[int, float]]:
+        """Splits rollouts across the workers & merges their root statistics. With a time limit, workers that have
+        not answered GRACE_MS after it are left out of the merge, unless none have answered"""
+        if self._in_process:
+            return search(info_set, rollouts, time_limit_ms, exploration, random.Random(self._seeder.getrandbits(64)))
+        per_worker = math.ceil(rollouts / self.workers)
+        futures = [self.executor.submit(_search_worker, info_set, per_worker, time_limit_ms, exploration,
+                                         self._seeder.getrandbits(64)) for _ in range(self.workers)]
+        done, not_done = wait(futures, timeout=(time_limit_ms + GRACE_MS) / 1000 if time_limit_ms else None)
+        if not done:
+            done, not_done = wait(futures, return_when=FIRST_COMPLETED)
+        for future in not_done:
+            future.cancel()
+
+        merged: dict[CompactMove, tuple[int, float]] = {}
+        for future in done:
+            for move, (visits, reward) in future.result().items():
+                total_visits, total_reward = merged.get(move, (0, 0.0))
+                merged[move] = total_visits + visits, total_reward + reward
+        return merged
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        """Started, & every worker warmed up, on first use"""
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self.workers)
+            wait([self._executor.submit(_warm_up) for _ in range(self.workers)])
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,192 @@
+"""A local game server: each connection plays games, one after another, against a bot on the server.
+
+The protocol is newline-delimited JSON over TCP. Cards are the codes of models.compact, & the server sends only what
+changed rather than whole states, built from the engine's change events (see models.changes):
+    server -> client
+        {"t": "deal", "you": 0, "round": 1, "dealer": 1, "hand": [codes], "deck": 24}
+        {"t": "turn"}                                          it is the client's move
+        {"t": "play", "p": 1, "card": 27, "discard": false}
+        {"t": "draw", "p": 0, "discard": false, "card": 12}    "card" only on the client's own draws
+        {"t": "error", "msg": "..."}                           the client's move was illegal; another turn follows
+        {"t": "round_end", "points": [..]}
+        {"t": "game_end", "totals": [..]}                      the next game's deal follows
+    client -> server, after each turn message
+        {"card": 12, "discard": false, "draw_discard": false}
+Finished sessions are pooled & their GameState reused by the next game; see load_client for a load generator.
+
+Example usage:
+    asyncio.run(serve('127.0.0.1', 8765))
+"""
+
+import asyncio
+from contextlib import suppress
+from dataclasses import dataclass, field
+import json
+from typing import Callable
+
+from gamenacki.common.log import Log, LogLevel
+from gamenacki.common.piles import Hand
+from gamenacki.lostcitinacki.async_engine import AsyncLostCities, AsyncPlayer, AsyncRenderer, SyncPlayer
+from gamenacki.lostcitinacki.models.cards import Card
+from gamenacki.lostcitinacki.models.changes import CardDrawn, CardPlayed, Change, GameEnded, RoundEnded, RoundStarted
+from gamenacki.lostcitinacki.models.compact import encode
+from gamenacki.lostcitinacki.models.constants import DrawFromStack, PlayToStack
+from gamenacki.lostcitinacki.models.game_state import GameState
+from gamenacki.lostcitinacki.players import BotPlayer, Player
+
+CLIENT_IDX = 0
+BOT_IDX = 1
+SESSION_LOG_CAPACITY = 64
+
+
+def send(writer: asyncio.StreamWriter, message: dict) -> None:
+    writer.write(json.dumps(message, separators=(',', ':')).encode() + b'\n')
+
+
+@dataclass
+class RemotePlayer(AsyncPlayer):
+    """Asks the client for a move & waits for it; the move's draw is answered by pick_up_from"""
+    writer: asyncio.StreamWriter = None
+    moves: asyncio.Queue = field(default_factory=asyncio.Queue)
+    _draw_from: DrawFromStack = field(default=DrawFromStack.DECK, init=False, repr=False)
+
+    async def play_card(self, h: Hand, board_playable_cards: list[Card]) -> tuple[Card, PlayToStack]:
+        send(self.writer, {'t': 'turn'})
+        await self.writer.drain()
+        move = await self.moves.get()
+        code = move['card']
+        self._draw_from = DrawFromStack.DISCARD if move.get('draw_discard') else DrawFromStack.DECK
+        card = next((c for c in h if encode(c) == code), None)
+        if card is None:
+            raise ValueError(f"Card {code} is not in the hand")
+        return card, PlayToStack.DISCARD if move.get('discard') else PlayToStack.EXPEDITION
+
+    async def pick_up_from(self, can_pick_up_discard: bool, is_discard_card_playable: bool) -> DrawFromStack:
+        return self._draw_from
+
+
+class DeltaWriter(AsyncRenderer):
+    """Sends the engine's change events to the client as delta messages"""
+    wants_changes = True
+
+    def __init__(self):
+        self.writer: asyncio.StreamWriter | None = None
+
+    async def apply_changes(self, gs: GameState, players: list, changes: list[Change]) -> None:
+        for change in changes:
+            if isinstance(change, CardPlayed):
+                send(self.writer, {'t': 'play', 'p': change.player_idx, 'card': encode(change.card),
+                                   'discard': change.play_to == PlayToStack.DISCARD})
+            elif isinstance(change, CardDrawn):
+                message = {'t': 'draw', 'p': change.player_idx, 'discard': change.draw_from == DrawFromStack.DISCARD}
+                if change.player_idx == CLIENT_IDX:
+                    message['card'] = encode(change.card)
+                send(self.writer, message)
+            elif isinstance(change, RoundStarted):
+                send(self.writer, {'t': 'deal', 'you': CLIENT_IDX, 'round': change.round_number,
+                                   'dealer': change.dealer_idx, 'hand': [encode(c) for c in gs.piles.hands[CLIENT_IDX]],
+                                   'deck': len(gs.piles.deck)})
+            elif isinstance(change, RoundEnded):
+                send(self.writer, {'t': 'round_end', 'points': list(change.points)})
+            elif isinstance(change, GameEnded):
+                send(self.writer, {'t': 'game_end', 'totals': list(change.totals)})
+
+    async def render(self, gs: GameState, players: list) -> None:
+        pass
+
+    async def render_error(self, exc: Exception) -> None:
+        send(self.writer, {'t': 'error', 'msg': str(exc)})
+
+    async def render_log(self, game_log: Log) -> None:
+        pass
+
+
+class Session:
+    """One seat for a client & one for a bot, with an engine kept across games"""
+
+    def __init__(self, bot: Player, max_rounds: int = 3):
+        self.deltas = DeltaWriter()
+        self.remote = RemotePlayer(CLIENT_IDX, 'Client')
+        # the client is sent changes rather than the log, so a session only keeps its latest round summaries
+        self.game = AsyncLostCities([self.remote, SyncPlayer.wrap(bot, in_thread=False)], self.deltas,
+                                    log=Log(level=LogLevel.ROUNDS, capacity=SESSION_LOG_CAPACITY),
+                                    max_rounds=max_rounds, round_pause=0)
+        self._fresh = True
+
+    def start(self, writer: asyncio.StreamWriter, moves: asyncio.Queue) -> None:
+        self.remote.writer = self.deltas.writer = writer
+        self.remote.moves = moves
+        if not self._fresh:
+            self.game.new_game()
+        self._fresh = False
+
+
+class SessionPool:
+    """Idle sessions are kept, up to max_idle, & handed to the next game instead of building a new one"""
+
+    def __init__(self, bot_factory: Callable[[], Player] = lambda: BotPlayer(BOT_IDX, 'Bot', think_time=0),
+                 max_idle: int = 1024, max_rounds: int = 3):
+        self.bot_factory = bot_factory
+        self.max_idle = max_idle
+        self.max_rounds = max_rounds
+        self._idle: list[Session] = []
+        self.created_cnt = 0
+        self.in_use_cnt = 0
+
+    def acquire(self, writer: asyncio.StreamWriter, moves: asyncio.Queue) -> Session:
+        if self._idle:
+            session = self._idle.pop()
+        else:
+            session = Session(self.bot_factory(), self.max_rounds)
+            self.created_cnt += 1
+        session.start(writer, moves)
+        self.in_use_cnt += 1
+        return session
+
+    def release(self, session: Session) -> None:
+        self.in_use_cnt -= 1
+        if len(self._idle) < self.max_idle:
+            self._idle.append(session)
+
+
+async def _read_moves(reader: asyncio.StreamReader, moves: asyncio.Queue) -> None:
+    """Queues the client's moves until it disconnects or sends something that is not JSON"""
+    try:
+        while line := await reader.readline():
+            moves.put_nowait(json.loads(line))
+    except (ConnectionError, ValueError):
+        pass
+
+
+def handle_connection(pool: SessionPool):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        moves = asyncio.Queue()
+        reading = asyncio.create_task(_read_moves(reader, moves))
+        try:
+            while not reading.done():
+                session = pool.acquire(writer, moves)
+                playing = asyncio.create_task(session.game.play())
+                await asyncio.wait([playing, reading], return_when=asyncio.FIRST_COMPLETED)
+                if not playing.done():
+                    # the client left mid-game; new_game resets whatever state the game was left in
+                    playing.cancel()
+                    with suppress(asyncio.CancelledError):
+                        await playing
+                pool.release(session)
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            reading.cancel()
+            writer.close()
+    return handle
+
+
+async def start_server(host: str = '127.0.0.1', port: int = 8765, pool: SessionPool | None = None) -> asyncio.Server:
+    return await asyncio.start_server(handle_connection(pool or SessionPool()), host, port)
+
+
+async def serve(host: str = '127.0.0.1', port: int = 8765, pool: SessionPool | None = None) -> None:
+    server = await start_server(host, port, pool)
+    async with server:
+        await server.serve_forever()
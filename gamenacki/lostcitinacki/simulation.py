@@ -0,0 +1,75 @@
+"""Headless simulation: plays games back to back with no rendering and no sleeps.
+
+The Log only takes round & game boundaries unless a listener needs more, so plays & draws are not snapshotted for
+nothing; turns are counted by the engine.
+
+Example usage:
+    results = simulate(lambda: [BotPlayer(0, 'A', think_time=0), BotPlayer(1, 'B', think_time=0)], 1000, seed=7)
+"""
+
+from dataclasses import dataclass, field
+import random
+from typing import Callable
+
+from gamenacki.common.log import Event, Log, LogLevel
+from gamenacki.common.profiler import Profiler
+from gamenacki.common.rng import derive_seed
+from gamenacki.lostcitinacki.engine import LostCities
+from gamenacki.lostcitinacki.players import Player, BotPlayer
+from gamenacki.lostcitinacki.renderers import NullRenderer
+
+
+@dataclass
+class GameResult:
+    """The outcome of one headless game; replay it by passing seed to play_game"""
+    seed: int
+    winner: None | tuple[int, int] | list[tuple[int, int]]
+    ledgers: list[list[int]] = field(default_factory=list)
+    turn_cnts: list[int] = field(default_factory=list)
+    first_player_idx: int | None = None
+
+    @property
+    def turn_cnt(self) -> int:
+        return sum(self.turn_cnts)
+
+    @property
+    def totals(self) -> list[int]:
+        return [sum(ledger) for ledger in self.ledgers]
+
+
+def default_bot_factory() -> list[Player]:
+    return [BotPlayer(0, 'Bot 0', think_time=0), BotPlayer(1, 'Bot 1', think_time=0)]
+
+
+def log_level_for(listeners: list[Callable[[Event], None]]) -> LogLevel:
+    """LogLevel.ROUNDS, or the highest min_level a listener declares; plays & draws are only snapshotted for
+    listeners that need them"""
+    return max([LogLevel.ROUNDS, *(getattr(listener, 'min_level', LogLevel.OFF) for listener in listeners)])
+
+
+def play_game(players: list[Player], seed: int, max_rounds: int = 3,
+              listeners: list[Callable[[Event], None]] = (), profiler: Profiler | None = None,
+              log_level: LogLevel | None = None) -> GameResult:
+    """listeners are attached to the game's Log, ex: a GameRecordWriter; a profiler accumulates across games.
+    The Log's level is log_level, or else log_level_for(listeners)"""
+    log = Log(listeners=list(listeners), level=log_level_for(listeners) if log_level is None else log_level)
+    game = LostCities(players, NullRenderer(), log=log, max_rounds=max_rounds, round_pause=0, seed=seed,
+                      profiler=profiler)
+    first_player_idx = game.gs.dealer.player_turn_idx
+    game.play()
+    return GameResult(seed, game.gs.winner, [list(pl.ledger) for pl in game.gs.scorer.ledgers], game.turn_cnts,
+                      first_player_idx)
+
+
+def simulate(player_factory: Callable[[], list[Player]] = default_bot_factory, game_cnt: int = 1,
+             seed: int | None = None, max_rounds: int = 3,
+             listeners: list[Callable[[Event], None]] = (), profiler: Profiler | None = None,
+             first_game_idx: int = 0, log_level: LogLevel | None = None) -> list[GameResult]:
+    """player_factory is called once per game and must return fresh players with no think time.
+    Game i's seed is derived from the master seed & i alone, so any single game can be replayed from its
+    GameResult.seed, & workers can split one run by first_game_idx: simulate(..., 1000, seed, first_game_idx=3000)
+    plays games 3000-3999 of the run.
+    Measured with the default bots, no listeners & no profiler: about 450-540 games/s on one core (Python 3.11)"""
+    seed = random.getrandbits(64) if seed is None else seed
+    return [play_game(player_factory(), derive_seed(seed, 'game', i), max_rounds, listeners, profiler, log_level)
+            for i in range(first_game_idx, first_game_idx + game_cnt)]
@@ -0,0 +1,185 @@
+"""Card- & strategy-level statistics over many games, gathered in one pass without keeping the games.
+
+GameStats is a Log listener (or is fed GameResults with add_result) that holds only named RunningStats: expedition
+points by handshakes committed, how often an expedition reaches the 8-card bonus, how often draws come from the
+discard, win rates by seat & by which seat played first, round points & turns. Stats from worker processes merge
+exactly, & are written as columns (one list per field, one row per stat) that read_columns turns back into GameStats.
+
+Example usage:
+    stats = simulate_stats(game_cnt=100_000, seed=7, workers=4)
+    print(stats.report())
+    stats.write_columns('stats.json')
+
+    python -m gamenacki.lostcitinacki.stats --games 100000 --workers 4 --output stats.json
+"""
+
+import argparse
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import astuple, fields
+import json
+import random
+from typing import Callable
+
+from gamenacki.common.log import Event, LogLevel
+from gamenacki.common.rng import derive_seed
+from gamenacki.common.running_stats import RunningStat
+from gamenacki.lostcitinacki.models.compact import (EXPEDITION_POINTS, HANDSHAKE_BITS, SLOTS_PER_COLOR, color_idx_of,
+                                                     mask_add)
+from gamenacki.lostcitinacki.models.constants import Action, DrawFromStack
+from gamenacki.lostcitinacki.players import Player
+from gamenacki.lostcitinacki.simulation import GameResult, default_bot_factory, play_game
+
+BONUS_CARD_CNT = 8
+COLUMNS: tuple[str, ...] = tuple(f.name for f in fields(RunningStat))
+
+
+def _outcome(totals: list[int], p_idx: int) -> float:
+    """1 for an outright win, split evenly among tied winners, else 0"""
+    top = max(totals)
+    return 1 / totals.count(top) if totals[p_idx] == top else 0.0
+
+
+class GameStats:
+    """Feed it a Log's events or GameResults, not both for the same games. Pickup & turn stats need every action
+    logged (LogLevel.ACTIONS)"""
+
+    def __init__(self):
+        self.stats: defaultdict[str, RunningStat] = defaultdict(RunningStat)
+        self.game_cnt = 0
+        self._round_number = 0
+        self._first_player_idx: int | None = None
+        self._turn_cnt = 0
+
+    def __call__(self, event: Event) -> None:
+        gs, action = event.game_state, event.action
+        if action == Action.PLAY_CARD:
+            self._turn_cnt += 1
+        elif action == Action.PICKUP_CARD:
+            self.stats['discard pickup rate'].add(event.attributes['draw_from'] == DrawFromStack.DISCARD)
+        elif action == Action.BEGIN_ROUND and gs.round_number != self._round_number:
+            self._round_number, self._turn_cnt = gs.round_number, 0
+            if self._first_player_idx is None:
+                self._first_player_idx = gs.turn_idx
+        elif action == Action.END_ROUND:
+            self.stats['round turns'].add(self._turn_cnt)
+            for board, ledger in zip(gs.boards, gs.ledgers):
+                self.stats['round points'].add(ledger[-1])
+                self._add_board(board)
+        elif action == Action.END_GAME:
+            self._add_game([sum(ledger) for ledger in gs.ledgers], self._first_player_idx)
+        elif action == Action.BEGIN_GAME:
+            self._round_number, self._first_player_idx = 0, None
+
+    def _add_board(self, board: bytes) -> None:
+        """board is a snapshot's codes; each started expedition adds its points by handshakes & whether it got the
+        bonus"""
+        masks: defaultdict[int, int] = defaultdict(int)
+        for code in board:
+            masks[color_idx_of(code)] = mask_add(masks[color_idx_of(code)], code % SLOTS_PER_COLOR)
+        for mask in masks.values():
+            handshake_cnt = (mask & HANDSHAKE_BITS).bit_count()
+            self.stats[f'expedition points | {handshake_cnt} handshakes'].add(EXPEDITION_POINTS[mask])
+            self.stats['expedition bonus rate'].add(mask.bit_count() >= BONUS_CARD_CNT)
+
+    def _add_game(self, totals: list[int], first_player_idx: int | None) -> None:
+        self.game_cnt += 1
+        for p_idx, total in enumerate(totals):
+            self.stats['game points'].add(total)
+            self.stats[f'win rate | seat {p_idx}'].add(_outcome(totals, p_idx))
+        if first_player_idx is not None:
+            outcome = _outcome(totals, first_player_idx)
+            self.stats['first player win rate'].add(outcome)
+            self.stats[f'first player win rate | seat {first_player_idx} first'].add(outcome)
+
+    def add_result(self, result: GameResult) -> None:
+        """The stats a GameResult holds: round points & turns, game points & win rates"""
+        for round_idx, turn_cnt in enumerate(result.turn_cnts):
+            self.stats['round turns'].add(turn_cnt)
+            for ledger in result.ledgers:
+                self.stats['round points'].add(ledger[round_idx])
+        self._add_game(result.totals, result.first_player_idx)
+
+    def merge(self, other: "GameStats") -> None:
+        self.game_cnt += other.game_cnt
+        for name, stat in other.stats.items():
+            self.stats[name].merge(stat)
+
+    def to_columns(self) -> dict[str, list]:
+        """One list per RunningStat field plus 'stat' & game_cnt; holds all of each stat's state, so columns from
+        separate runs can be read back & merged"""
+        names = sorted(self.stats)
+        rows = [astuple(self.stats[name]) for name in names]
+        return {'game_cnt': self.game_cnt, 'stat': names, **{col: [row[i] for row in rows]
+                                                             for i, col in enumerate(COLUMNS)}}
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, list]) -> "GameStats":
+        stats = cls()
+        stats.game_cnt = columns['game_cnt']
+        for i, name in enumerate(columns['stat']):
+            stats.stats[name] = RunningStat(*(columns[col][i] for col in COLUMNS))
+        return stats
+
+    def write_columns(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_columns(), f, separators=(',', ':'))
+
+    @classmethod
+    def read_columns(cls, path: str) -> "GameStats":
+        with open(path) as f:
+            return cls.from_columns(json.load(f))
+
+    def report(self) -> str:
+        lines = [f"{self.game_cnt} games", f"{'stat':<48}{'n':>10}{'mean':>10}{'stdev':>10}{'min':>8}{'max':>8}"]
+        for name in sorted(self.stats):
+            s = self.stats[name]
+            lines.append(f"{name:<48}{s.n:>10}{s.mean:>10.3f}{s.stdev:>10.3f}{s.min:>8g}{s.max:>8g}")
+        return '\n'.join(lines)
+
+
+def stats_for_games(player_factory: Callable[[], list[Player]], seed: int, first_game_idx: int, game_cnt: int,
+                    max_rounds: int = 3) -> GameStats:
+    """Games first_game_idx onward of the run seeded by seed (the same games simulate plays), each dropped once
+    counted"""
+    stats = GameStats()
+    for i in range(first_game_idx, first_game_idx + game_cnt):
+        play_game(player_factory(), derive_seed(seed, 'game', i), max_rounds, [stats], log_level=LogLevel.ACTIONS)
+    return stats
+
+
+def simulate_stats(player_factory: Callable[[], list[Player]] = default_bot_factory, game_cnt: int = 1,
+                   seed: int | None = None, max_rounds: int = 3, workers: int = 1,
+                   chunk_size: int = 1000) -> GameStats:
+    """Splits the run into chunks of games played by worker processes & merges their stats as they finish.
+    player_factory must be picklable (ex: a module-level function) when workers > 1"""
+    seed = random.getrandbits(64) if seed is None else seed
+    chunks = [(first, min(chunk_size, game_cnt - first)) for first in range(0, game_cnt, chunk_size)]
+    stats = GameStats()
+    if workers <= 1:
+        for first, cnt in chunks:
+            stats.merge(stats_for_games(player_factory, seed, first, cnt, max_rounds))
+        return stats
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [pool.submit(stats_for_games, player_factory, seed, first, cnt, max_rounds) for first, cnt in chunks]
+        for future in as_completed(futures):
+            stats.merge(future.result())
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gather statistics over simulated bot games")
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--output', default=None, help="file the stats' columns are written to, as JSON")
+    args = parser.parse_args()
+
+    stats = simulate_stats(game_cnt=args.games, seed=args.seed, workers=args.workers)
+    print(stats.report())
+    if args.output:
+        stats.write_columns(args.output)
+
+
+if __name__ == '__main__':
+    main()
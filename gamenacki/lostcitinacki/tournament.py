@@ -0,0 +1,203 @@
+"""Round-robin & Swiss tournaments of Player implementations, played headless across a process pool.
+
+Every match gets a seed derived from the tournament seed and the match's position, so any single match
+can be replayed with play_match(match). A tournament starts its worker processes once, on its first matches, & keeps
+them for every later round until it is closed.
+
+Example usage:
+    entrants = [Entrant('Random', BotPlayer, {'think_time': 0}), Entrant('Other', OtherBot)]
+    with Tournament(entrants, seed=7) as tournament:
+        standings = tournament.swiss(rounds=5, games_per_pair=100)
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import math
+import os
+
+from gamenacki.common.rng import derive_seed
+from gamenacki.lostcitinacki.players import Player
+from gamenacki.lostcitinacki.simulation import GameResult, play_game
+
+Z_95 = 1.96
+
+
+@dataclass(frozen=True)
+class Entrant:
+    """player_cls is instantiated as player_cls(idx, name, **kwargs); it & kwargs must be picklable, ex: an importable
+    class. A RolloutPool in kwargs searches within each worker process"""
+    name: str
+    player_cls: type[Player]
+    kwargs: dict = field(default_factory=dict, hash=False)
+
+    def create_player(self, idx: int) -> Player:
+        return self.player_cls(idx, self.name, **self.kwargs)
+
+
+@dataclass(frozen=True)
+class Match:
+    """One game between seated entrants; seats[i] plays as player idx i"""
+    seats: tuple[Entrant, Entrant]
+    seed: int
+    max_rounds: int = 3
+
+
+@dataclass
+class MatchResult:
+    match: Match
+    result: GameResult
+
+    @property
+    def seat_scores(self) -> list[float]:
+        """1 for a win, 0.5 each for a tie, 0 for a loss"""
+        winner = self.result.winner
+        if isinstance(winner, tuple):
+            return [1.0 if i == winner[0] else 0.0 for i in range(len(self.match.seats))]
+        tied = [idx for idx, _ in winner] if winner else []
+        return [1 / len(tied) if i in tied else 0.0 for i in range(len(self.match.seats))]
+
+
+@dataclass
+class Standing:
+    entrant: Entrant
+    games: int = 0
+    score: float = 0
+    margins: list[int] = field(default_factory=list, repr=False)
+    opponents: set[str] = field(default_factory=set, repr=False)
+
+    @property
+    def win_rate(self) -> float:
+        return self.score / self.games if self.games else 0
+
+    @property
+    def win_rate_ci(self) -> tuple[float, float]:
+        """Wilson score interval at 95%"""
+        if not self.games:
+            return 0, 1
+        n, p = self.games, self.win_rate
+        denominator = 1 + Z_95 ** 2 / n
+        center = (p + Z_95 ** 2 / (2 * n)) / denominator
+        spread = Z_95 * math.sqrt(p * (1 - p) / n + Z_95 ** 2 / (4 * n ** 2)) / denominator
+        return center - spread, center + spread
+
+    @property
+    def mean_margin(self) -> float:
+        return sum(self.margins) / len(self.margins) if self.margins else 0
+
+    @property
+    def mean_margin_ci(self) -> tuple[float, float]:
+        """Normal approximation at 95% of the mean point margin versus the opponent"""
+        n = len(self.margins)
+        if n < 2:
+            return -math.inf, math.inf
+        variance = sum((m - self.mean_margin) ** 2 for m in self.margins) / (n - 1)
+        spread = Z_95 * math.sqrt(variance / n)
+        return self.mean_margin - spread, self.mean_margin + spread
+
+    def add(self, score: float, margin: int, opponent: str) -> None:
+        self.games += 1
+        self.score += score
+        self.margins.append(margin)
+        self.opponents.add(opponent)
+
+
+def match_seed(tournament_seed: int, *path: int | str) -> int:
+    """A 64-bit seed that depends only on the tournament seed & the match's position in the schedule"""
+    return derive_seed(tournament_seed, *path)
+
+
+def play_match(match: Match) -> MatchResult:
+    players = [e.create_player(i) for i, e in enumerate(match.seats)]
+    return MatchResult(match, play_game(players, match.seed, match.max_rounds))
+
+
+@dataclass
+class Tournament:
+    entrants: list[Entrant]
+    seed: int = 0
+    max_rounds: int = 3
+    max_workers: int | None = None
+    standings: dict[str, Standing] = field(default_factory=dict)
+    results: list[MatchResult] = field(default_factory=list, repr=False)
+    _pool: ProcessPoolExecutor | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if len({e.name for e in self.entrants}) != len(self.entrants):
+            raise ValueError("Entrant names must be unique")
+        self.standings = {e.name: Standing(e) for e in self.entrants}
+
+    def __enter__(self) -> "Tournament":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def workers(self) -> int:
+        return self.max_workers or os.cpu_count() or 1
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        """Started on first use & reused by every later run, until close"""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        return self._pool
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    @property
+    def ranked(self) -> list[Standing]:
+        return sorted(self.standings.values(), key=lambda s: (s.win_rate, s.mean_margin), reverse=True)
+
+    def round_robin(self, games_per_pair: int = 2) -> list[Standing]:
+        """Every pair of entrants plays games_per_pair games, alternating who sits in seat 0"""
+        matches = []
+        for i, a in enumerate(self.entrants):
+            for b in self.entrants[i + 1:]:
+                for g in range(games_per_pair):
+                    seats = (a, b) if g % 2 == 0 else (b, a)
+                    matches.append(Match(seats, match_seed(self.seed, 'rr', a.name, b.name, g), self.max_rounds))
+        self.run(matches)
+        return self.ranked
+
+    def swiss(self, rounds: int, games_per_pair: int = 2) -> list[Standing]:
+        """Each round pairs entrants of similar standing who have not yet met; an odd entrant out sits the round"""
+        for round_no in range(rounds):
+            matches = []
+            for a, b in self.swiss_pairings():
+                for g in range(games_per_pair):
+                    seats = (a, b) if g % 2 == 0 else (b, a)
+                    matches.append(Match(seats, match_seed(self.seed, 'swiss', round_no, a.name, b.name, g),
+                                         self.max_rounds))
+            self.run(matches)
+        return self.ranked
+
+    def swiss_pairings(self) -> list[tuple[Entrant, Entrant]]:
+        unpaired = [s.entrant for s in self.ranked]
+        pairs = []
+        while len(unpaired) > 1:
+            a = unpaired.pop(0)
+            met = self.standings[a.name].opponents
+            b = next((e for e in unpaired if e.name not in met), unpaired[0])
+            unpaired.remove(b)
+            pairs.append((a, b))
+        return pairs
+
+    def run(self, matches: list[Match]) -> list[MatchResult]:
+        """Plays matches across the tournament's process pool & merges the results into the standings"""
+        chunksize = max(1, len(matches) // (4 * self.workers))
+        results = list(self.pool.map(play_match, matches, chunksize=chunksize))
+        for mr in results:
+            self.record(mr)
+        return results
+
+    def record(self, mr: MatchResult) -> None:
+        self.results.append(mr)
+        totals = mr.result.totals
+        for seat, (entrant, score) in enumerate(zip(mr.match.seats, mr.seat_scores)):
+            opponent_seat = 1 - seat
+            self.standings[entrant.name].add(score, totals[seat] - totals[opponent_seat],
+                                             mr.match.seats[opponent_seat].name)
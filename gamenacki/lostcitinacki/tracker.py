@@ -0,0 +1,116 @@
+"""What one player can infer about the other hands & the deck, kept up to date from the Log as the game is played.
+
+Every card is either in the viewer's hand, public (on a board or in the discard), known to be in another hand (it
+was picked up from the discard), or unseen: somewhere among the other hands' unknown cards & the deck. The tracker
+only uses what the viewer could see: the public plays & draws, its own hand & the pile sizes.
+
+Example usage:
+    tracker = HandTracker(1)
+    bot = ISMCTSPlayer(1, 'TreeBot', tracker=tracker)
+    LostCities([ConsolePlayer(0, 'Nacki'), bot], ConsoleRenderer(), log=Log(listeners=[tracker])).play()
+"""
+
+import math
+
+from gamenacki.common.log import Event, LogLevel
+from gamenacki.lostcitinacki.models.compact import CARD_CNT, CARDS, encode
+from gamenacki.lostcitinacki.models.constants import Action, DrawFromStack, PlayToStack
+from gamenacki.lostcitinacki.models.piles import FULL_DECK
+
+FULL_DECK_COUNTS: tuple[int, ...] = tuple(sum(1 for c in FULL_DECK if encode(c) == code) for code in range(CARD_CNT))
+
+
+class HandTracker:
+    """A Log listener for viewer p_idx; it needs every play & draw logged. Counts are per card code (see
+    models.compact), so a color's handshakes share one count"""
+    min_level = LogLevel.ACTIONS
+
+    def __init__(self, p_idx: int):
+        self.p_idx = p_idx
+        self.round_number = 0
+        self.unseen: list[int] = [0] * CARD_CNT
+        self.known: list[list[int]] = []
+        self.hand_sizes: list[int] = []
+        self.deck_size = 0
+        self._discard: list[int] = []
+
+    def __call__(self, event: Event) -> None:
+        gs, action = event.game_state, event.action
+        if action == Action.BEGIN_ROUND and gs.round_number != self.round_number:
+            self.start_round(gs.round_number, gs.hands[self.p_idx], [len(h) for h in gs.hands], len(gs.deck))
+        elif action == Action.PLAY_CARD:
+            self.played(event.player_idx, encode(event.attributes['card']),
+                        event.attributes['play_to'] == PlayToStack.DISCARD)
+        elif action == Action.PICKUP_CARD:
+            drawn = gs.hands[self.p_idx][-1] if event.player_idx == self.p_idx else None
+            self.drew(event.player_idx, event.attributes['draw_from'] == DrawFromStack.DISCARD, drawn)
+        elif action == Action.BEGIN_GAME:
+            self.round_number = 0
+
+    def start_round(self, round_number: int, hand: bytes, hand_sizes: list[int], deck_size: int) -> None:
+        self.round_number = round_number
+        self.unseen = list(FULL_DECK_COUNTS)
+        for code in hand:
+            self.unseen[code] -= 1
+        self.known = [[0] * CARD_CNT for _ in hand_sizes]
+        self.hand_sizes = list(hand_sizes)
+        self.deck_size = deck_size
+        self._discard = []
+
+    def played(self, p_idx: int, code: int, to_discard: bool) -> None:
+        if p_idx != self.p_idx:
+            if self.known[p_idx][code]:
+                self.known[p_idx][code] -= 1
+            else:
+                self.unseen[code] -= 1
+        if to_discard:
+            self._discard.append(code)
+        self.hand_sizes[p_idx] -= 1
+
+    def drew(self, p_idx: int, from_discard: bool, code: int | None = None) -> None:
+        """code is the card drawn, which only the viewer sees when drawing from the deck"""
+        if from_discard:
+            code = self._discard.pop()
+            if p_idx != self.p_idx:
+                self.known[p_idx][code] += 1
+        else:
+            self.deck_size -= 1
+            if p_idx == self.p_idx:
+                self.unseen[code] -= 1
+        self.hand_sizes[p_idx] += 1
+
+    def unseen_codes(self) -> list[int]:
+        return [code for code, n in enumerate(self.unseen) for _ in range(n)]
+
+    def known_codes(self, p_idx: int) -> list[int]:
+        return [code for code, n in enumerate(self.known[p_idx]) for _ in range(n)]
+
+    def unknown_slots(self, p_idx: int) -> int:
+        """How many of p_idx's cards the viewer cannot name"""
+        return self.hand_sizes[p_idx] - sum(self.known[p_idx])
+
+    def expected_in_hand(self, p_idx: int) -> list[float]:
+        """Expected copies of each code in p_idx's hand, with the unseen cards spread uniformly over the unknown
+        hand slots & the deck"""
+        positions = self.deck_size + sum(self.unknown_slots(i) for i in range(len(self.hand_sizes)) if i != self.p_idx)
+        share = self.unknown_slots(p_idx) / positions if positions else 0.0
+        return [known + unseen * share for known, unseen in zip(self.known[p_idx], self.unseen)]
+
+    def probabilities(self, p_idx: int) -> list[float]:
+        """The chance that p_idx holds at least one copy of each code"""
+        positions = self.deck_size + sum(self.unknown_slots(i) for i in range(len(self.hand_sizes)) if i != self.p_idx)
+        slots = self.unknown_slots(p_idx)
+        probabilities = []
+        for known, unseen in zip(self.known[p_idx], self.unseen):
+            if known:
+                probabilities.append(1.0)
+            elif not unseen or not positions:
+                probabilities.append(0.0)
+            else:
+                probabilities.append(1 - math.comb(positions - unseen, slots) / math.comb(positions, slots))
+        return probabilities
+
+    def __repr__(self) -> str:
+        known = {i: [CARDS[code] for code in self.known_codes(i)] for i in range(len(self.known)) if i != self.p_idx}
+        return (f"HandTracker(p_idx={self.p_idx}, round={self.round_number}, unseen={sum(self.unseen)}, "
+                f"known={known}, hand_sizes={self.hand_sizes}, deck={self.deck_size})")
@@ -0,0 +1,61 @@
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from gamenacki.lostcitinacki.batch import BatchGames, board_points
+from gamenacki.lostcitinacki.models.compact import CompactState, encode
+from gamenacki.lostcitinacki.models.constants import DrawFromStack, PlayToStack
+from gamenacki.lostcitinacki.models.game_state import GameState
+
+
+def test_batch_replays_the_object_engine():
+    rng = random.Random(5)
+    states = [GameState.create_game_state(2, 3, random.Random(seed)) for seed in range(6)]
+    for round_number in range(1, 4):
+        games = BatchGames.from_game_states(states)
+        while not all(gs.is_round_over for gs in states):
+            codes = np.zeros(len(states), int)
+            to_discard, from_discard = np.zeros(len(states), bool), np.zeros(len(states), bool)
+            for i, gs in enumerate(states):
+                if gs.is_round_over:
+                    continue
+                move = rng.choice(gs.legal_moves())
+                c, play_to, draw_from = move
+                codes[i], to_discard[i] = encode(c), play_to == PlayToStack.DISCARD
+                from_discard[i] = draw_from == DrawFromStack.DISCARD
+                gs.apply(move)
+            games.step(codes, to_discard, from_discard)
+            for i, gs in enumerate(states):
+                assert games.compact_state(i) == CompactState.from_game_state(gs)
+        assert games.is_round_over.all()
+        games.assign_points()
+        for i, gs in enumerate(states):
+            gs.assign_points()
+            assert games.ledgers[i, :, :round_number].tolist() == [pl.ledger for pl in gs.scorer.ledgers]
+            assert board_points(games.boards[i]).tolist() == [board.points for board in gs.piles.exp_boards]
+        if round_number < 3:
+            for gs in states:
+                gs.create_new_round()
+
+
+def test_illegal_discard_draws_raise_and_change_nothing():
+    games = BatchGames.from_game_states([GameState.create_game_state(2, 3, random.Random(1))])
+    gs = GameState.create_game_state(2, 3, random.Random(1))
+    code = encode(gs.piles.hands[gs.dealer.player_turn_idx].cards[0])
+    before = games.compact_state(0)
+    for to_discard in (True, False):  # right after discarding, & from an empty discard
+        with pytest.raises(ValueError):
+            games.step(np.array([code]), np.array([to_discard]), np.array([True]))
+        assert games.compact_state(0) == before
+    games.step(np.array([code]), np.array([True]), np.array([False]))
+    gs.apply((gs.piles.hands[gs.dealer.player_turn_idx].cards[0], PlayToStack.DISCARD, DrawFromStack.DECK))
+    assert games.compact_state(0) == CompactState.from_game_state(gs)
+
+
+def test_random_actions_are_legal():
+    rng = np.random.default_rng(3)
+    games = BatchGames.new(200, rng)
+    games.play(rng)  # step raises on any illegal move
+    assert games.is_game_over
@@ -0,0 +1,57 @@
+from dataclasses import FrozenInstanceError
+import random
+
+import pytest
+
+from gamenacki.lostcitinacki.models.cards import DECK_CARDS, ExpeditionCard
+from gamenacki.lostcitinacki.models.compact import CARDS, decode, encode
+from gamenacki.lostcitinacki.models.constants import Color
+from gamenacki.lostcitinacki.models.game_state import GameState
+from gamenacki.lostcitinacki.models.piles import FULL_DECK
+
+
+def _ids(cards) -> set[int]:
+    return {id(c) for c in cards}
+
+
+def test_cards_are_frozen():
+    c = FULL_DECK[-1]
+    with pytest.raises(FrozenInstanceError):
+        c.value = 2
+    assert ExpeditionCard(Color.RED, 7) == ExpeditionCard(Color.RED, 7)
+
+
+def test_every_pile_holds_the_deck_flyweights():
+    assert FULL_DECK is DECK_CARDS and len(_ids(FULL_DECK)) == 40
+    assert _ids(CARDS) <= _ids(FULL_DECK)
+    assert all(decode(encode(c)) == c and decode(encode(c)) in FULL_DECK for c in FULL_DECK)
+    gs = GameState.create_game_state(2, 3, random.Random(1))
+    while not gs.is_round_over:
+        gs.apply(gs.legal_moves()[0])
+    gs.create_new_round()
+    rebuilt = GameState.from_snapshot(gs.snapshot(), gs.max_rounds)
+    for state in (gs, rebuilt):
+        piles = state.piles
+        held = [*piles.deck, *piles.discard, *(c for h in piles.hands for c in h),
+                *(c for board in piles.exp_boards for exp in board for c in exp)]
+        assert _ids(held) <= _ids(FULL_DECK)
+
+
+def test_snapshot_round_trips_to_an_equal_game_state():
+    rng = random.Random(6)
+    gs = GameState.create_game_state(2, 3, rng)
+    for round_number in range(1, 4):
+        while not gs.is_round_over:
+            assert GameState.from_snapshot(gs.snapshot(), gs.max_rounds) == gs
+            gs.apply(rng.choice(gs.legal_moves()))
+        gs.assign_points()
+        assert GameState.from_snapshot(gs.snapshot(), gs.max_rounds) == gs
+        if round_number < 3:
+            gs.create_new_round()
+
+
+def test_a_rebuilt_game_state_deals_shuffled_rounds():
+    gs = GameState.create_game_state(2, 3, random.Random(2))
+    rebuilt = GameState.from_snapshot(gs.snapshot(), gs.max_rounds, random.Random(3))
+    rebuilt.create_new_round()
+    assert list(rebuilt.piles.deck) != list(FULL_DECK)[:len(rebuilt.piles.deck)]
@@ -0,0 +1,31 @@
+import random
+
+from gamenacki.lostcitinacki.models.compact import CARDS, CompactState, encode
+from gamenacki.lostcitinacki.models.constants import DrawFromStack, PlayToStack
+from gamenacki.lostcitinacki.models.game_state import GameState
+
+
+def _compact(move) -> tuple[int, bool, bool]:
+    c, play_to, draw_from = move
+    return encode(c), play_to == PlayToStack.DISCARD, draw_from == DrawFromStack.DISCARD
+
+
+def test_compact_state_follows_the_object_game_state():
+    for seed in range(5):
+        rng = random.Random(seed)
+        gs = GameState.create_game_state(2, 3, rng)
+        cs = CompactState.from_game_state(gs)
+        while not gs.is_round_over:
+            moves = gs.legal_moves()
+            assert cs.legal_moves() == sorted(_compact(m) for m in moves)
+            move = rng.choice(moves)
+            before = cs.copy()
+            token = cs.apply(_compact(move))
+            cs.undo(token)
+            assert cs == before
+            cs.apply(_compact(move))
+            gs.apply(move)
+            assert cs == CompactState.from_game_state(gs)
+            assert [cs.is_playable(encode(c)) for c in CARDS] == [gs.is_card_playable(c) for c in CARDS]
+        assert cs.is_round_over and cs.legal_moves() == []
+        assert [cs.points(i) for i in range(2)] == [board.points for board in gs.piles.exp_boards]
@@ -0,0 +1,32 @@
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from gamenacki.common.log import Log, LogLevel
+from gamenacki.lostcitinacki.dataset import DecisionRecorder, generate, open_shards
+from gamenacki.lostcitinacki.simulation import simulate
+
+
+def test_shards_hold_one_record_per_turn(tmp_path):
+    report = generate(str(tmp_path), game_cnt=6, seed=7, games_per_chunk=2, shard_size=100)
+    records = np.concatenate(open_shards(str(tmp_path)))
+    assert len(records) == report.sample_cnt == sum(r.turn_cnt for r in simulate(game_cnt=6, seed=7))
+    assert (records['hand'].sum(axis=1) == 8).all()
+
+
+def test_workers_write_the_records_one_process_writes(tmp_path):
+    generate(str(tmp_path / 'one'), game_cnt=4, seed=7, games_per_chunk=2)
+    generate(str(tmp_path / 'two'), game_cnt=4, seed=7, games_per_chunk=2, workers=2)
+    one, two = (np.concatenate(open_shards(str(tmp_path / name))) for name in ('one', 'two'))
+    assert (one == two).all()
+
+
+def test_refuses_a_directory_with_an_earlier_run(tmp_path):
+    generate(str(tmp_path), game_cnt=1, seed=7)
+    with pytest.raises(ValueError):
+        generate(str(tmp_path), game_cnt=1, seed=8)
+
+
+def test_recorder_refuses_a_log_without_actions():
+    with pytest.raises(ValueError):
+        Log(listeners=[DecisionRecorder(lambda records: None)], level=LogLevel.ROUNDS)
@@ -0,0 +1,46 @@
+import random
+
+from gamenacki.lostcitinacki.endgame import EndgameSolver, ordered_moves
+from gamenacki.lostcitinacki.models.compact import CompactState, board_points
+from gamenacki.lostcitinacki.models.game_state import GameState
+
+
+def _late_positions(cnt: int, deck_size: int) -> list[CompactState]:
+    """Rounds of random legal moves, each stopped once the deck is down to deck_size cards"""
+    rng = random.Random(deck_size)
+    positions = []
+    while len(positions) < cnt:
+        gs = GameState.create_game_state(2, 3, rng)
+        while len(gs.piles.deck) > deck_size and not gs.is_round_over:
+            gs.apply(rng.choice(gs.legal_moves()))
+        if not gs.is_round_over:
+            positions.append(CompactState.from_game_state(gs))
+    return positions
+
+
+def _minimax(cs: CompactState, p_idx: int) -> int:
+    """Every legal move of every line, with no pruning"""
+    if cs.is_round_over:
+        points = [board_points(board) for board in cs.boards]
+        return points[p_idx] - points[1 - p_idx]
+    values = []
+    for move in cs.legal_moves():
+        token = cs.apply(move)
+        values.append(_minimax(cs, p_idx))
+        cs.undo(token)
+    return max(values) if cs.turn_idx == p_idx else min(values)
+
+
+def test_solver_agrees_with_minimax():
+    solver = EndgameSolver(p_idx=0)
+    for cs in _late_positions(5, 1) + _late_positions(5, 2) + _late_positions(5, 3):
+        value, move = solver.solve(cs)
+        assert value == _minimax(cs, 0)
+        token = cs.apply(move)
+        assert _minimax(cs, 0) == value
+        cs.undo(token)
+
+
+def test_ordered_moves_are_legal_moves():
+    for cs in _late_positions(15, 3):
+        assert set(ordered_moves(cs)) <= set(cs.legal_moves())
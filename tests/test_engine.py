@@ -0,0 +1,73 @@
+import asyncio
+
+from gamenacki.common.log import Log
+from gamenacki.lostcitinacki.async_engine import AsyncLostCities, AsyncPlayer
+from gamenacki.lostcitinacki.engine import LostCities
+from gamenacki.lostcitinacki.models.constants import Action, DrawFromStack
+from gamenacki.lostcitinacki.players import BotPlayer
+from gamenacki.lostcitinacki.renderers import NullRenderer
+from gamenacki.lostcitinacki.simulation import default_bot_factory
+
+
+def _turns(log: Log) -> list:
+    return [(e.action, e.player_idx, e.attributes, e.game_state) for e in log]
+
+
+def test_async_engine_plays_the_seeded_game_the_sync_engine_plays():
+    sync_game = LostCities(default_bot_factory(), NullRenderer(), round_pause=0, seed=5)
+    sync_game.play()
+    async_game = AsyncLostCities(default_bot_factory(), NullRenderer(), round_pause=0, seed=5)
+    asyncio.run(async_game.play())
+    assert _turns(async_game.log) == _turns(sync_game.log)
+    assert next(iter(async_game.log)).attributes['seed'] == 5
+
+
+def test_async_new_game_with_a_seed_replays_it():
+    game = AsyncLostCities(default_bot_factory(), NullRenderer(), round_pause=0)
+    game.new_game(seed=9)
+    asyncio.run(game.play())
+    first = _turns(game.log)
+    game.new_game(seed=9)
+    asyncio.run(game.play())
+    assert _turns(game.log) == first
+
+
+class StallingPlayer(AsyncPlayer):
+    """Never answers; remembers the first legal move of each turn & how often it was asked where to draw from"""
+
+    def __init__(self, idx: int, name: str):
+        super().__init__(idx, name)
+        self.first_moves, self.pick_up_cnt = [], 0
+
+    async def observe(self, gs) -> None:
+        self.first_moves.append(gs.legal_moves()[0][:2])
+
+    async def play_card(self, h, board_playable_cards):
+        await asyncio.Event().wait()
+
+    async def pick_up_from(self, can_pick_up_discard, is_discard_card_playable):
+        self.pick_up_cnt += 1
+        await asyncio.Event().wait()
+
+
+class ErrorCounter(NullRenderer):
+    def __init__(self):
+        self.errors = []
+
+    def render_error(self, exc: Exception) -> None:
+        self.errors.append(exc)
+
+
+def test_a_timed_out_player_plays_the_first_legal_move_and_draws_from_the_deck():
+    staller, renderer = StallingPlayer(0, 'Staller'), ErrorCounter()
+    game = AsyncLostCities([staller, BotPlayer(1, 'Bot', think_time=0)], renderer, max_rounds=1, round_pause=0,
+                           seed=4, move_timeout=0.005)
+    asyncio.run(game.play())
+    plays = [(e.attributes['card'], e.attributes['play_to']) for e in game.log
+             if e.action == Action.PLAY_CARD and e.player_idx == 0]
+    draws = [e.attributes['draw_from'] for e in game.log if e.action == Action.PICKUP_CARD and e.player_idx == 0]
+    assert plays == staller.first_moves
+    assert draws == [DrawFromStack.DECK] * len(plays)
+    assert staller.pick_up_cnt > 0
+    assert len(renderer.errors) == len(plays) + staller.pick_up_cnt
+    assert all(isinstance(exc, TimeoutError) for exc in renderer.errors)
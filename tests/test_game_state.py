@@ -0,0 +1,58 @@
+import random
+
+from gamenacki.lostcitinacki.models.game_state import GameState
+from gamenacki.lostcitinacki.models.snapshot import GameStateSnapshot
+from gamenacki.lostcitinacki.models.zobrist import key_of
+
+
+def _random_round(seed: int):
+    """Yields the GameState before each move of a round of random legal moves, with the move"""
+    rng = random.Random(seed)
+    gs = GameState.create_game_state(2, 3, rng)
+    while not gs.is_round_over:
+        move = rng.choice(gs.legal_moves())
+        yield gs, move
+        gs.apply(move)
+
+
+def test_undo_restores_the_state_apply_changed():
+    for gs, move in _random_round(1):
+        before = gs.snapshot()
+        token = gs.apply(move)
+        gs.undo(token)
+        assert gs.snapshot() == before
+        rebuilt = GameState.from_snapshot(before, gs.max_rounds)
+        assert gs.color_maxes == rebuilt.color_maxes
+        assert gs.board_playable_cards == rebuilt.board_playable_cards
+
+
+def test_apply_plays_as_the_engine_does():
+    for gs, move in _random_round(2):
+        c, play_to, draw_from = move
+        copy = GameState.from_snapshot(gs.snapshot(), gs.max_rounds)
+        copy.play_card_to(gs.dealer.player_turn_idx, c, play_to)
+        copy.draw_from(gs.dealer.player_turn_idx, draw_from)
+        token = gs.apply(move)
+        assert gs.snapshot() == copy.snapshot()
+        gs.undo(token)
+
+
+def test_legal_moves_are_distinct_and_end_with_the_round():
+    for gs, _ in _random_round(3):
+        moves = gs.legal_moves()
+        assert len(moves) == len(set(moves))
+    assert gs.is_round_over and gs.legal_moves() == []
+
+
+def test_clear_caches_after_changing_piles_directly():
+    gs = GameState.create_game_state(2, 3, random.Random(4))
+    gs.snapshot(), gs.board_playable_cards, gs.zobrist_key
+    c = gs.piles.hands[0].cards[0]
+    gs.piles.hands[0].remove(c)
+    next(exp for exp in gs.piles.exp_boards[0] if exp.color == c.color).push(c)
+    gs.reset_color_maxes()
+    gs.clear_caches()
+    rebuilt = GameState.from_snapshot(GameStateSnapshot.from_game_state(gs), gs.max_rounds)
+    assert gs.snapshot() == rebuilt.snapshot()
+    assert gs.board_playable_cards == rebuilt.board_playable_cards
+    assert gs.zobrist_key == key_of(gs)
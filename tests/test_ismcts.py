@@ -0,0 +1,31 @@
+from gamenacki.common.eval_cache import EvalCache
+from gamenacki.lostcitinacki.engine import LostCities
+from gamenacki.lostcitinacki.ismcts import InformationSet, ISMCTSPlayer
+from gamenacki.lostcitinacki.renderers import NullRenderer
+from gamenacki.lostcitinacki.simulation import default_bot_factory
+
+
+def _game_state(seed: int = 3):
+    return LostCities(default_bot_factory(), NullRenderer(), round_pause=0, seed=seed).gs
+
+
+def test_information_set_key_ignores_hidden_cards():
+    gs = _game_state()
+    key = InformationSet.from_game_state(gs, 1).key()
+    hidden, deck = gs.piles.hands[0].cards, gs.piles.deck._items
+    i = next(i for i, c in enumerate(deck) if c not in hidden)
+    hidden[0], deck[i] = deck[i], hidden[0]
+    assert InformationSet.from_game_state(gs, 1).key() == key
+    assert InformationSet.from_game_state(gs, 0).key() != key
+
+
+def test_players_with_other_settings_do_not_share_moves():
+    gs = _game_state()
+    cache = EvalCache()
+    for player in (ISMCTSPlayer(1, 'A', rollouts=50, seed=1, cache=cache),
+                   ISMCTSPlayer(1, 'B', rollouts=50, seed=1, cache=cache, endgame_samples=4),
+                   ISMCTSPlayer(1, 'C', rollouts=50, seed=1, cache=cache, time_limit_ms=1000)):
+        player.choose_move(gs)
+    assert len(cache) == 3
+    ISMCTSPlayer(1, 'D', rollouts=50, seed=2, cache=cache).choose_move(gs)
+    assert len(cache) == 3 and cache.hits == 1
@@ -0,0 +1,27 @@
+import random
+
+from gamenacki.lostcitinacki.models.cards import DECK_CARDS
+from gamenacki.lostcitinacki.models.piles import ExpeditionBoard
+
+
+def _points(cards: list) -> int:
+    """The rules' scoring, walking the cards"""
+    if not cards:
+        return 0
+    handshakes = sum(1 for c in cards if not c.value)
+    return (sum(c.value for c in cards) - 20) * (1 + handshakes) + (20 if len(cards) >= 8 else 0)
+
+
+def test_running_counts_score_as_the_rules_do():
+    rng = random.Random(1)
+    boards = [ExpeditionBoard() for _ in range(50)]
+    for board in boards:
+        for exp in board:
+            cards = sorted(rng.sample([c for c in DECK_CARDS if c.color == exp.color], rng.randint(0, 8)),
+                           key=lambda c: c.value)
+            for c in cards:
+                exp.push(c)
+            if cards and rng.random() < 0.3:
+                exp.pop()
+    expected = [sum(_points(list(exp)) for exp in board) for board in boards]
+    assert [board.points for board in boards] == expected
@@ -0,0 +1,31 @@
+from gamenacki.common.profiler import Profiler
+from gamenacki.lostcitinacki.simulation import default_bot_factory, play_game
+
+
+def test_phases_count_a_short_game():
+    profiler = Profiler()
+    result = play_game(default_bot_factory(), 3, max_rounds=2, profiler=profiler)
+    assert result == play_game(default_bot_factory(), 3, max_rounds=2)
+    turns = result.turn_cnt
+    calls = profiler.phase_calls
+    assert calls['play_card_to'] == calls['draw_from'] == turns
+    assert calls['assign_points'] == 2
+    assert calls['create_new_round'] == 1
+    assert turns <= calls['decide'] <= 2 * turns  # plus a pick-up decision whenever the discard could be drawn
+    assert calls['render'] == turns + 2 + 1  # each turn, each round's end & the game's end
+    assert calls['log'] == 2 * turns + 2 * 2 + 1  # a play & a draw per turn, each round's start & end, the game's end
+    assert set(profiler.seconds) == set(calls)
+    assert all(seconds > 0 for seconds in profiler.seconds.values())
+
+
+def test_merge_adds_totals_and_report_lists_every_phase():
+    profiler, total = Profiler(), Profiler()
+    play_game(default_bot_factory(), 3, max_rounds=1, profiler=profiler)
+    total.merge(profiler)
+    total.merge(profiler)
+    assert total.phase_calls == {name: 2 * n for name, n in profiler.phase_calls.items()}
+    assert total.seconds['decide'] == 2 * profiler.seconds['decide']
+    report = profiler.report()
+    assert all(name in report for name in profiler.phase_calls)
+    profiler.reset()
+    assert not profiler.seconds and not profiler.phase_calls and not profiler.counts
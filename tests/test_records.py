@@ -0,0 +1,40 @@
+import io
+
+import pytest
+
+from gamenacki.common.log import Log, LogLevel
+from gamenacki.lostcitinacki.archive import GameArchive, GameArchiveWriter
+from gamenacki.lostcitinacki.models.constants import Action
+from gamenacki.lostcitinacki.records import GameRecordWriter, MAGIC, RoundEndRecord, iter_records
+from gamenacki.lostcitinacki.simulation import default_bot_factory, play_game, simulate
+
+
+def test_writer_refuses_a_log_without_actions():
+    with pytest.raises(ValueError):
+        Log(listeners=[GameRecordWriter(io.BytesIO())], level=LogLevel.ROUNDS)
+    with pytest.raises(ValueError):
+        Log(level=LogLevel.ROUNDS).add_listener(GameRecordWriter(io.BytesIO()))
+
+
+def test_records_hold_each_round_points():
+    stream = io.BytesIO()
+    result = play_game(default_bot_factory(), 3, listeners=[GameRecordWriter(stream)])
+    records = list(iter_records(stream.getvalue(), len(MAGIC)))
+    assert [list(r.points) for r in records if isinstance(r, RoundEndRecord)] == [list(t) for t in
+                                                                                  zip(*result.ledgers)]
+
+
+def test_archive_replays_each_game(tmp_path):
+    path = str(tmp_path / 'games.lca')
+    events = []
+    with GameArchiveWriter(path) as writer:
+        results = simulate(game_cnt=3, seed=4, listeners=[writer, events.append])
+    pickups = [e.game_state for e in events[:next(i for i, e in enumerate(events) if e.action == Action.END_ROUND)]
+               if e.action == Action.PICKUP_CARD]
+    with GameArchive(path) as archive:
+        assert archive.game_cnt == 3
+        for game_idx, result in enumerate(results):
+            assert list(archive.summary(game_idx).points) == result.totals
+        for turn in range(1, len(pickups)):
+            assert archive.replay(0, turn).snapshot() == pickups[turn - 1]
+        assert archive.replay(2).snapshot() == events[-1].game_state
@@ -0,0 +1,39 @@
+import math
+import random
+import statistics
+
+from gamenacki.common.running_stats import RunningStat
+from gamenacki.lostcitinacki.stats import GameStats, stats_for_games
+from gamenacki.lostcitinacki.simulation import default_bot_factory
+
+
+def _stat(values: list[float]) -> RunningStat:
+    stat = RunningStat()
+    for x in values:
+        stat.add(x)
+    return stat
+
+
+def test_merged_parts_match_one_pass():
+    rng = random.Random(1)
+    values = [rng.gauss(50, 30) for _ in range(1000)]
+    merged = RunningStat()
+    for start, end in ((0, 0), (0, 1), (1, 400), (400, 401), (401, 1000)):
+        merged.merge(_stat(values[start:end]))
+    whole = _stat(values)
+    assert merged.n == whole.n == len(values)
+    assert math.isclose(merged.mean, statistics.fmean(values))
+    assert math.isclose(merged.variance, statistics.variance(values))
+    assert math.isclose(merged.mean, whole.mean) and math.isclose(merged.m2, whole.m2)
+    assert (merged.min, merged.max) == (min(values), max(values))
+
+
+def test_game_stats_merge_like_one_run():
+    whole = stats_for_games(default_bot_factory, 7, 0, 6)
+    merged = stats_for_games(default_bot_factory, 7, 0, 2)
+    merged.merge(stats_for_games(default_bot_factory, 7, 2, 4))
+    assert merged.game_cnt == whole.game_cnt and sorted(merged.stats) == sorted(whole.stats)
+    for name, stat in whole.stats.items():
+        assert merged.stats[name].n == stat.n
+        assert math.isclose(merged.stats[name].mean, stat.mean, abs_tol=1e-9)
+    assert GameStats.from_columns(whole.to_columns()).stats == whole.stats
@@ -0,0 +1,48 @@
+import asyncio
+import json
+import random
+
+from gamenacki.lostcitinacki.load_client import _ClientGame
+from gamenacki.lostcitinacki.models.compact import CARD_CNT
+from gamenacki.lostcitinacki.server import CLIENT_IDX, SessionPool, send, start_server
+
+
+async def _play_games(game_cnt: int) -> tuple[list[dict], SessionPool]:
+    """Plays game_cnt games on one loopback connection, sending one card that is not in the hand first; returns
+    every message the server sent"""
+    pool = SessionPool()
+    server = await start_server('127.0.0.1', 0, pool)
+    reader, writer = await asyncio.open_connection('127.0.0.1', server.sockets[0].getsockname()[1])
+    game, messages, refused = _ClientGame(random.Random(2)), [], False
+    while sum(1 for m in messages if m['t'] == 'game_end') < game_cnt:
+        message = json.loads(await reader.readline())
+        messages.append(message)
+        if message['t'] == 'turn':
+            send(writer, game.choose() if refused else {'card': CARD_CNT, 'discard': True})
+            refused = True
+        elif message['t'] == 'deal':
+            game.deal(message['hand'])
+        elif message['t'] in ('play', 'draw'):
+            game.apply(message, CLIENT_IDX)
+            if message['t'] == 'draw' and message['p'] == CLIENT_IDX:
+                assert len(game.hand) == 8
+    writer.close()
+    await writer.wait_closed()
+    while pool.in_use_cnt:
+        await asyncio.sleep(0.01)
+    server.close()
+    await server.wait_closed()
+    return messages, pool
+
+
+def test_a_client_plays_over_loopback():
+    messages, pool = asyncio.run(asyncio.wait_for(_play_games(2), 30))
+    assert [m['t'] for m in messages].count('error') == 1
+    assert messages[messages.index({'t': 'error', 'msg': f"Card {CARD_CNT} is not in the hand"}) + 1] == {'t': 'turn'}
+    round_points = [m['points'] for m in messages if m['t'] == 'round_end']
+    totals = [m['totals'] for m in messages if m['t'] == 'game_end']
+    assert len(round_points) == 6
+    assert totals == [[sum(points[p] for points in round_points[g * 3:g * 3 + 3]) for p in range(2)] for g in range(2)]
+    assert [m['round'] for m in messages if m['t'] == 'deal'] == [1, 2, 3] * 2
+    assert pool.created_cnt == 1  # the second game reused the first's session
+
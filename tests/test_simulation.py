@@ -0,0 +1,26 @@
+from gamenacki.common.log import LogLevel
+from gamenacki.lostcitinacki.models.constants import Action
+from gamenacki.lostcitinacki.simulation import default_bot_factory, play_game, simulate
+
+
+def test_seeded_game_is_reproducible():
+    assert play_game(default_bot_factory(), 7) == play_game(default_bot_factory(), 7)
+
+
+def test_reused_players_replay_each_seed():
+    players = default_bot_factory()
+    play_game(players, 1)
+    assert play_game(players, 2) == play_game(default_bot_factory(), 2)
+
+
+def test_result_seed_replays_its_game():
+    for result in simulate(game_cnt=3, seed=11):
+        assert play_game(default_bot_factory(), result.seed) == result
+
+
+def test_turns_are_counted_without_logging_them():
+    events = []
+    result = play_game(default_bot_factory(), 5, listeners=[events.append], log_level=LogLevel.ACTIONS)
+    assert result == play_game(default_bot_factory(), 5)
+    assert result.turn_cnt == sum(1 for e in events if e.action == Action.PLAY_CARD)
+    assert result.first_player_idx == events[1].game_state.turn_idx
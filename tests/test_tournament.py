@@ -0,0 +1,27 @@
+from gamenacki.lostcitinacki.ismcts import ISMCTSPlayer
+from gamenacki.lostcitinacki.players import BotPlayer
+from gamenacki.lostcitinacki.rollout_pool import RolloutPool
+from gamenacki.lostcitinacki.tournament import Entrant, Match, Tournament, play_match
+
+
+def test_swiss_reuses_one_pool_and_replays_matches():
+    entrants = [Entrant(name, BotPlayer, {'think_time': 0}) for name in 'ABCD']
+    with Tournament(entrants, seed=7, max_workers=2) as tournament:
+        tournament.swiss(rounds=1, games_per_pair=2)
+        pool = tournament.pool
+        tournament.swiss(rounds=1, games_per_pair=2)
+        assert tournament.pool is pool
+    assert tournament._pool is None
+    assert sum(s.games for s in tournament.standings.values()) == 2 * 2 * 2 * 2
+    mr = tournament.results[0]
+    assert play_match(Match(mr.match.seats, mr.match.seed, mr.match.max_rounds)).result == mr.result
+
+
+def test_an_entrant_may_hold_a_rollout_pool():
+    with RolloutPool(workers=2, seed=1) as pool:
+        entrants = [Entrant('Pooled', ISMCTSPlayer, {'rollouts': 20, 'pool': pool}),
+                    Entrant('Bot', BotPlayer, {'think_time': 0})]
+        with Tournament(entrants, seed=3, max_workers=2) as tournament:
+            tournament.round_robin(games_per_pair=2)
+        assert pool._executor is None  # the pickled copies searched in the tournament's workers
+    assert sum(s.games for s in tournament.standings.values()) == 2 * 2
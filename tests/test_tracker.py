@@ -0,0 +1,46 @@
+from collections import Counter
+
+import pytest
+
+from gamenacki.common.log import Log, LogLevel
+from gamenacki.lostcitinacki.engine import LostCities
+from gamenacki.lostcitinacki.ismcts import InformationSet
+from gamenacki.lostcitinacki.players import BotPlayer
+from gamenacki.lostcitinacki.renderers import NullRenderer
+from gamenacki.lostcitinacki.tracker import HandTracker
+
+
+class CheckingBot(BotPlayer):
+    """Compares the tracker's view with one taken from the live GameState before each of its turns"""
+    tracker: HandTracker = None
+    checks: int = 0
+
+    def observe(self, gs) -> None:
+        tracked = InformationSet.from_tracker(gs, self.tracker)
+        walked = InformationSet.from_game_state(gs, self.idx)
+        known = [c for codes in tracked.known for c in codes]
+        assert Counter(tracked.unseen) + Counter(known) == Counter(walked.unseen)
+        assert tracked.hand_sizes == walked.hand_sizes and tracked.deck_size == walked.deck_size
+        self.checks += 1
+
+
+def test_tracker_follows_the_game():
+    tracker = HandTracker(1)
+    bot = CheckingBot(1, 'Checker', think_time=0)
+    bot.tracker = tracker
+    LostCities([BotPlayer(0, 'Bot', think_time=0), bot], NullRenderer(), log=Log(listeners=[tracker]), round_pause=0,
+               seed=3).play()
+    assert bot.checks > 0
+
+
+def test_tracker_refuses_a_log_without_actions():
+    with pytest.raises(ValueError):
+        Log(listeners=[HandTracker(0)], level=LogLevel.ROUNDS)
+
+
+def test_stale_tracker_is_refused():
+    game = LostCities([BotPlayer(0, 'Bot', think_time=0), BotPlayer(1, 'Bot', think_time=0)], NullRenderer(),
+                      round_pause=0, seed=3)
+    tracker = HandTracker(1)
+    with pytest.raises(ValueError):
+        InformationSet.from_tracker(game.gs, tracker)
@@ -0,0 +1,25 @@
+import random
+
+from gamenacki.lostcitinacki.models.zobrist import key_of
+from gamenacki.lostcitinacki.models.game_state import GameState
+
+
+def test_incremental_key_matches_a_full_rekey():
+    rng = random.Random(2)
+    gs = GameState.create_game_state(2, 3, rng)
+    tokens = [gs.apply(rng.choice(gs.legal_moves())) for _ in range(3)]  # before the key is first read
+    while not gs.is_round_over:
+        assert gs.zobrist_key == key_of(gs)
+        tokens.append(gs.apply(rng.choice(gs.legal_moves())))
+    assert gs.zobrist_key == key_of(gs)
+    for token in reversed(tokens):
+        gs.undo(token)
+        assert gs.zobrist_key == key_of(gs)
+    gs.create_new_round()
+    assert gs.zobrist_key == key_of(gs)
+    c, play_to, draw_from = gs.legal_moves()[0]
+    p_idx = gs.dealer.player_turn_idx
+    gs.play_card_to(p_idx, c, play_to)
+    assert gs.zobrist_key == key_of(gs)
+    gs.draw_from(p_idx, draw_from)
+    assert gs.zobrist_key == key_of(gs)